@@ -286,47 +286,56 @@ const DATA_SOURCES = [
     }
 ];
 
-// Load films from multiple JSON files
+// Load films from embedded JSON data (static build) or multiple JSON files
 async function loadFilms() {
     try {
         let loadedSources = 0;
         let totalFilms = 0;
         allFilms = [];
         
-        console.log('🎬 Loading films from multiple sources...');
-        
-        for (const source of DATA_SOURCES) {
-            try {
-                console.log(`📋 Loading from ${source.name}...`);
-                
-                let response = await fetch(source.file);
-                
-                // Try fallback if main file fails
-                if (!response.ok && source.fallback) {
-                    console.log(`⚠️  Primary file failed, trying fallback for ${source.name}...`);
-                    response = await fetch(source.fallback);
-                }
-                
-                if (response.ok) {
-                    const films = await response.json();
+        // static_generator.py embeds the merged films as a JSON script element
+        const filmsDataElement = document.getElementById('films-data');
+        if (filmsDataElement) {
+            allFilms = JSON.parse(filmsDataElement.textContent);
+            loadedSources = new Set(allFilms.flatMap(film => film.data_sources || [])).size;
+            totalFilms = allFilms.length;
+            console.log(`📋 Loaded ${totalFilms} films from embedded data`);
+        } else {
+            console.log('🎬 Loading films from multiple sources...');
+            
+            for (const source of DATA_SOURCES) {
+                try {
+                    console.log(`📋 Loading from ${source.name}...`);
                     
-                    // Add source information to each film
-                    films.forEach(film => {
-                        film.data_source = source.name;
-                        film.source_file = response.url.split('/').pop();
-                    });
+                    let response = await fetch(source.file);
                     
-                    allFilms.push(...films);
-                    loadedSources++;
-                    totalFilms += films.length;
+                    // Try fallback if main file fails
+                    if (!response.ok && source.fallback) {
+                        console.log(`⚠️  Primary file failed, trying fallback for ${source.name}...`);
+                        response = await fetch(source.fallback);
+                    }
                     
-                    console.log(`✅ Loaded ${films.length} films from ${source.name}`);
-                } else {
-                    console.log(`❌ Failed to load from ${source.name}`);
+                    if (response.ok) {
+                        const films = await response.json();
+                        
+                        // Add source information to each film
+                        films.forEach(film => {
+                            film.data_source = source.name;
+                            film.source_file = response.url.split('/').pop();
+                        });
+                        
+                        allFilms.push(...films);
+                        loadedSources++;
+                        totalFilms += films.length;
+                        
+                        console.log(`✅ Loaded ${films.length} films from ${source.name}`);
+                    } else {
+                        console.log(`❌ Failed to load from ${source.name}`);
+                    }
+                    
+                } catch (error) {
+                    console.error(`Error loading ${source.name}:`, error);
                 }
-                
-            } catch (error) {
-                console.error(`Error loading ${source.name}:`, error);
             }
         }
         
@@ -364,7 +373,7 @@ async function loadFilms() {
         
         console.log(`🎉 Successfully loaded ${allFilms.length} films from ${loadedSources} sources`);
         
-        if (allFilms.length === 0) {
+        if (allFilms.length === 0 && !filmsDataElement) {
             throw new Error('No films data found from any source');
         }
         
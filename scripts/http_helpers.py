@@ -0,0 +1,147 @@
+"""
+Shared helpers for the scripts that call rate-limited web APIs
+(tmdb_enricher.py and translate_json_fields.py): a token-bucket rate
+limiter, a retrying request loop and a small SQLite cache.
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import time
+from typing import Any, Awaitable, Callable, Optional
+import httpx
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
+
+_json_loads = orjson.loads if orjson else json.loads
+
+# Responses worth retrying: rate limits and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` requests per ``period`` seconds and bursts of ``burst``."""
+    
+    def __init__(self, rate: float, period: float = 1.0, burst: int = 1):
+        """Create the limiter.
+        
+        Args:
+            rate: Requests allowed per ``period``. 0 or less disables limiting.
+            period: Length in seconds of the window ``rate`` applies to
+            burst: Requests that may start back to back. Capped at one
+                period's worth, so a low rate is not overrun by the burst.
+        """
+        self.rate = rate / period if rate > 0 else 0.0
+        self.capacity = min(burst, max(1, int(rate)))
+        self._tokens = float(self.capacity)
+        self._updated: Optional[float] = None
+    
+    async def wait(self) -> None:
+        """Take a token, sleeping until it has been refilled if the bucket is empty."""
+        if not self.rate:
+            return
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # Going negative reserves a future token, so waiters queue up fairly
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+async def send_with_retry(send: Callable[[], Awaitable[httpx.Response]], limiter: RateLimiter,
+                          label: str, log: Callable[[str], Any],
+                          max_attempts: int = 5, max_backoff: float = 30.0) -> httpx.Response:
+    """Send a rate-limited request, retrying rate limits and transient failures.
+    
+    429 and 5xx responses and transport errors are retried up to
+    ``max_attempts`` times, waiting for ``Retry-After`` when the server
+    sends it and otherwise backing off exponentially with jitter. Any other
+    response is returned as-is.
+    
+    Args:
+        send: Starts one attempt of the request
+        limiter: Rate limiter every attempt waits on
+        label: What is being requested, for the retry messages
+        log: Called with each retry message
+        max_attempts: Attempts before the last response or error is given up on
+        max_backoff: Longest exponential backoff in seconds
+    
+    Returns:
+        The final response
+    
+    Raises:
+        httpx.TransportError: If the last attempt fails to connect
+    """
+    for attempt in range(1, max_attempts + 1):
+        await limiter.wait()
+        delay = min(max_backoff, 2.0 ** (attempt - 1)) + random.random()
+        try:
+            response = await send()
+        except httpx.TransportError as e:
+            if attempt == max_attempts:
+                raise
+            reason = str(e) or type(e).__name__
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == max_attempts:
+                return response
+            retry_after = response.headers.get('retry-after', '')
+            if retry_after.isdigit():
+                delay = float(retry_after)
+            reason = f"HTTP {response.status_code}"
+        
+        log(f"  ⏳ {reason} for {label}, retrying in {delay:.1f}s ({attempt}/{max_attempts - 1})")
+        await asyncio.sleep(delay)
+
+
+class SQLiteCache:
+    """Small SQLite-backed cache of JSON values with an optional per-entry TTL."""
+    
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        """Open (or create) the cache database.
+        
+        Args:
+            path: SQLite database file
+            ttl: Seconds a cached value stays valid. None keeps values forever.
+        """
+        self.ttl = ttl
+        # Autocommit plus WAL: each write is its own short transaction and
+        # readers never block, so several processes can share one cache
+        # (translate_json_fields runs one worker per input file)
+        self.conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+        )
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None if missing or expired."""
+        row = self.conn.execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time())
+        ).fetchone()
+        return _json_loads(row[0]) if row else None
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``, committing it right away."""
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), expires)
+        )
+    
+    def flush(self) -> None:
+        """Drop expired entries."""
+        self.conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+    
+    def close(self) -> None:
+        """Drop expired entries and close the database."""
+        self.flush()
+        self.conn.close()
@@ -10,30 +10,78 @@ import json
 import os
 import argparse
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # Optional: embed assets unminified
+    rcssmin = None
+    rjsmin = None
+
+
+@lru_cache(maxsize=32)
+def _read_file_cached(file_path: str, mtime: float, binary: bool = False):
+    """Read a file; ``mtime`` is part of the cache key so edits invalidate it."""
+    if binary:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+# Cinema label per data file, keyed by a substring of the file name
+_SOURCE_LABELS = {
+    'cinemateket': 'Cinemateket',
+    'biorio': 'Bio Rio',
+    'fagelbla': 'Bio Fågel Blå',
+    'zita': 'Zita Folkets Bio',
+    'klarabiografen': 'Klarabiografen',
+    'capitolbio': 'Capitol',
+    'bioaspen': 'Bio Aspen',
+    'biobristol': 'Bio Bristol',
+}
+
+
+def _source_label(source_file: str) -> str:
+    """Return the cinema label for a data file, or 'Cinema' if it is unknown."""
+    name = source_file.lower()
+    return next((label for key, label in _SOURCE_LABELS.items() if key in name), 'Cinema')
+
+
+def _parse_json_source(file_path: str):
+    """Read and parse one JSON data source."""
+    with open(file_path, 'rb') as f:
+        return json.loads(f.read())
+
+
 class StaticHTMLGenerator:
     """Generates static HTML files by embedding CSS, JS, and JSON data."""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = False):
         self.base_dir = Path.cwd()
+        self.verbose = verbose
         
-    def read_file(self, file_path: str) -> str:
+    def read_file(self, file_path: str, binary: bool = False):
         """Read file content with error handling.
-        
+
+        Contents are memoized per (path, mtime), so repeated generations in
+        the same process skip the filesystem until the file changes.
+
         Args:
             file_path: Path to file to read
+            binary: Return raw bytes instead of decoded text
             
         Returns:
-            File content as string
+            File content as string (or bytes if binary)
             
         Raises:
             FileNotFoundError: If file doesn't exist
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return _read_file_cached(file_path, os.path.getmtime(file_path), binary)
         except FileNotFoundError:
             raise FileNotFoundError(f"Required file not found: {file_path}")
         except Exception as e:
@@ -72,43 +120,27 @@ class StaticHTMLGenerator:
         
         print("🔍 Looking for film data sources...")
         
+        # Read and parse each source, then tag and merge in order
         for source_file in possible_sources:
-            if os.path.exists(source_file):
-                try:
-                    with open(source_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        
-                    # Add source information to each film
-                    for film in data:
-                        if 'data_source' not in film:
-                            if 'cinemateket' in source_file.lower():
-                                film['data_source'] = 'Cinemateket'
-                            elif 'biorio' in source_file.lower():
-                                film['data_source'] = 'Bio Rio'
-                            elif 'fagelbla' in source_file.lower():
-                                film['data_source'] = 'Bio Fågel Blå'
-                            elif 'zita' in source_file.lower():
-                                film['data_source'] = 'Zita Folkets Bio'
-                            elif 'klarabiografen' in source_file.lower():
-                                film['data_source'] = 'Klarabiografen'
-                            elif 'capitolbio' in source_file.lower():
-                                film['data_source'] = 'Capitol'
-                            elif 'bioaspen' in source_file.lower():
-                                film['data_source'] = 'Bio Aspen'
-                            elif 'biobristol' in source_file.lower():
-                                film['data_source'] = 'Bio Bristol'
-                            else:
-                                film['data_source'] = 'Cinema'
-                        film['source_file'] = source_file
-                    
-                    merged_films.extend(data)
-                    loaded_sources.append(f"{source_file} ({len(data)} films)")
-                    print(f"  ✅ Loaded {len(data)} films from {source_file}")
+            if not os.path.exists(source_file):
+                continue
+            try:
+                data = _parse_json_source(source_file)
                     
-                except json.JSONDecodeError as e:
-                    print(f"  ⚠️  Invalid JSON in {source_file}: {e}")
-                except Exception as e:
-                    print(f"  ⚠️  Error reading {source_file}: {e}")
+                # Add source information to each film
+                label = _source_label(source_file)
+                for film in data:
+                    film.setdefault('data_source', label)
+                    film['source_file'] = source_file
+                
+                merged_films.extend(data)
+                loaded_sources.append(f"{source_file} ({len(data)} films)")
+                print(f"  ✅ Loaded {len(data)} films from {source_file}")
+                
+            except json.JSONDecodeError as e:
+                print(f"  ⚠️  Invalid JSON in {source_file}: {e}")
+            except Exception as e:
+                print(f"  ⚠️  Error reading {source_file}: {e}")
         
         if not merged_films:
             raise FileNotFoundError(f"No valid JSON data files found. Checked: {', '.join(possible_sources)}")
@@ -121,28 +153,29 @@ class StaticHTMLGenerator:
         
         return json.dumps(unique_films, ensure_ascii=False)
     
+    @staticmethod
+    def _merge_key(film) -> str:
+        """Return the merge key for a film: TMDB ID, or title + release year as fallback."""
+        tmdb = film.get('tmdb') or {}
+        tmdb_id = tmdb.get('id')
+        if tmdb_id:
+            return f"tmdb_{tmdb_id}"
+        
+        title = film.get('title', '').lower().strip()
+        release_date = tmdb.get('release_date')
+        year = release_date[:4] if isinstance(release_date, str) else ''
+        return f"title_{title}_{year}"
+    
     def _merge_multi_cinema_films(self, films):
         """Merge films showing at multiple cinemas based on TMDB ID or title+year fallback."""
         film_map = {}
         merged_count = 0
+        merge_events = []
         
-        for film in films:
-            # Primary key: TMDB ID if available
-            tmdb_id = film.get('tmdb', {}).get('id')
-            
-            # Fallback key: title + year
-            title = film.get('title', '').lower().strip()
-            year = ''
-            if film.get('tmdb', {}).get('release_date'):
-                try:
-                    year = str(film['tmdb']['release_date'][:4])
-                except:
-                    pass
-            title_year_key = f"{title}_{year}"
-            
-            # Use TMDB ID as primary key, title+year as fallback
-            key = f"tmdb_{tmdb_id}" if tmdb_id else f"title_{title_year_key}"
-            
+        # Compute every merge key in one pass before the merge loop
+        merge_keys = [self._merge_key(film) for film in films]
+        
+        for film, key in zip(films, merge_keys):
             if key in film_map:
                 # Merge with existing film
                 existing_film = film_map[key]
@@ -153,17 +186,16 @@ class StaticHTMLGenerator:
                 new_cinemas = film.get('cinemas', [])
                 existing_film['cinemas'] = existing_cinemas + new_cinemas
                 
-                # Merge showtimes with cinema source information
+                # Merge showtimes with cinema source information. The films were
+                # freshly parsed by load_json_data, so tag showtimes in place.
                 existing_showtimes = existing_film.get('showtimes', [])
-                new_showtimes = []
-                for showtime in film.get('showtimes', []):
-                    new_showtime = {**showtime}
-                    new_showtime['source_cinema'] = film.get('data_source', '')
-                    new_showtime['source_cinemas'] = film.get('cinemas', [])
+                new_showtimes = film.get('showtimes', [])
+                for showtime in new_showtimes:
+                    showtime['source_cinema'] = film.get('data_source', '')
+                    showtime['source_cinemas'] = film.get('cinemas', [])
                     if film.get('url'):
-                        new_showtime['source_url'] = film['url']
-                    new_showtimes.append(new_showtime)
-                
+                        showtime['source_url'] = film['url']
+
                 existing_film['showtimes'] = existing_showtimes + new_showtimes
                 
                 # Merge data sources
@@ -188,7 +220,7 @@ class StaticHTMLGenerator:
                             if value and (key not in existing_film['tmdb'] or not existing_film['tmdb'][key]):
                                 existing_film['tmdb'][key] = value
                 
-                print(f"  🎭 Merged multi-cinema film: {film.get('title', 'Unknown')} (now at {len(existing_film['data_sources'])} cinemas)")
+                merge_events.append((film.get('title', 'Unknown'), len(existing_film['data_sources'])))
                 
             else:
                 # Add new film with proper structure for potential future merging
@@ -206,6 +238,14 @@ class StaticHTMLGenerator:
                 
                 film_map[key] = new_film
         
+        if self.verbose:
+            for title, cinema_count in merge_events:
+                print(f"  🎭 Merged multi-cinema film: {title} (now at {cinema_count} cinemas)")
+        elif merge_events:
+            titles = ', '.join(title for title, _ in merge_events[:10])
+            more = '...' if len(merge_events) > 10 else ''
+            print(f"  🎭 Merged {len(merge_events)} multi-cinema films: {titles}{more}")
+        
         unique_films = list(film_map.values())
         multi_cinema_count = len([f for f in unique_films if len(f.get('data_sources', [])) > 1])
         
@@ -215,221 +255,87 @@ class StaticHTMLGenerator:
         
         return unique_films
     
-    def embed_css(self, html_content: str, css_content: str) -> str:
-        """Embed CSS content into HTML.
+    def _strip_embedded_assets(self, html_content: bytes) -> bytes:
+        """Remove CSS, JavaScript and JSON blocks left over from a previous embed.
         
         Args:
-            html_content: Original HTML content
-            css_content: CSS content to embed
+            html_content: Original HTML content as UTF-8 bytes
             
         Returns:
-            HTML with embedded CSS
+            HTML without previously embedded assets
         """
-        css_link_pattern = '<link rel="stylesheet" href="assets/styles.css">'
-        css_embed = f'<style>\n{css_content}\n</style>'
-        
-        # Remove any existing embedded CSS styles first
-        html_content = re.sub(r'<style>.*?</style>', '', html_content, flags=re.DOTALL)
-        # Clean up any duplicate style tags
-        html_content = re.sub(r'(<style[^>]*>.*?</style>\s*)+', '', html_content, flags=re.DOTALL)
-        
-        if css_link_pattern in html_content:
-            return html_content.replace(css_link_pattern, css_embed)
-        else:
-            # Insert before closing </head> tag
-            return html_content.replace('</head>', f'    {css_embed}\n</head>')
+        html_content = re.sub(rb'<style>.*?</style>', b'', html_content, flags=re.DOTALL)
+        html_content = re.sub(rb'(<style[^>]*>.*?</style>\s*)+', b'', html_content, flags=re.DOTALL)
+        html_content = re.sub(rb'(<script id="films-data"[^>]*>.*?</script>\s*)+', b'', html_content, flags=re.DOTALL)
+        html_content = re.sub(rb'<script>\s*\n.*?</script>', b'', html_content, flags=re.DOTALL)
+        html_content = re.sub(rb'(<script>(?!.*type="application/json").*?</script>\s*)+', b'', html_content, flags=re.DOTALL)
+        return html_content
     
-    def embed_javascript(self, html_content: str, js_content: str) -> str:
-        """Embed JavaScript content into HTML.
+    def _assemble_static(self, html_content: bytes, css_content: str, json_content: str, js_content: str) -> bytes:
+        """Embed CSS, JSON data and JavaScript into HTML in a single pass.
         
-        Args:
-            html_content: Original HTML content
-            js_content: JavaScript content to embed
-            
-        Returns:
-            HTML with embedded JavaScript
-        """
-        js_link_pattern = '<script src="assets/script.js"></script>'
-        js_embed = f'<script>\n{js_content}\n</script>'
-        
-        # Remove any existing embedded JavaScript (but keep JSON data scripts)
-        # More precise pattern to avoid removing scripts with attributes
-        html_content = re.sub(r'<script>\s*\n.*?</script>', '', html_content, flags=re.DOTALL)
-        # Clean up any duplicate script tags (but preserve JSON data scripts)
-        html_content = re.sub(r'(<script>(?!.*type="application/json").*?</script>\s*)+', '', html_content, flags=re.DOTALL)
-        
-        if js_link_pattern in html_content:
-            return html_content.replace(js_link_pattern, js_embed)
-        else:
-            # Insert before closing </body> tag
-            return html_content.replace('</body>', f'    {js_embed}\n</body>')
-    
-    def embed_json_data(self, html_content: str, json_content: str) -> str:
-        """Embed JSON data into HTML.
+        The CSS replaces the stylesheet link (or goes before </head>), the
+        JSON data goes before the first inline <script> (or </body>) and the
+        JavaScript replaces the script link (or goes before </body>). Every
+        insertion point is located up front and the output is built with
+        one join. The template stays as UTF-8 bytes throughout; only the
+        embedded assets are encoded.
         
         Args:
-            html_content: Original HTML content
+            html_content: HTML template (UTF-8 bytes) without embedded assets
+            css_content: CSS content to embed
             json_content: JSON content to embed
+            js_content: JavaScript content to embed
             
         Returns:
-            HTML with embedded JSON data
+            HTML with all assets embedded, as UTF-8 bytes
         """
-        # Remove any existing JSON data scripts first
-        html_content = re.sub(r'<script id="films-data" type="application/json">.*?</script>', '', html_content, flags=re.DOTALL)
-        # Also clean up any leftover duplicate patterns
-        html_content = re.sub(r'(<script id="films-data"[^>]*>.*?</script>\s*)+', '', html_content, flags=re.DOTALL)
-        
-        # Create JSON data script element
+        css_link_pattern = b'<link rel="stylesheet" href="assets/styles.css">'
+        js_link_pattern = b'<script src="assets/script.js"></script>'
+        css_embed = f'<style>\n{css_content}\n</style>'
+        js_embed = f'<script>\n{js_content}\n</script>'
         json_script = f'<script id="films-data" type="application/json">{json_content}</script>'
         
-        # Insert before the main JavaScript (or before </body>)
-        if '<script>' in html_content:
-            # Insert before the first script tag
-            return html_content.replace('<script>', f'    {json_script}\n    <script>')
-        else:
-            # Insert before closing </body> tag
-            return html_content.replace('</body>', f'    {json_script}\n</body>')
-    
-    def modify_javascript_for_embedded_data(self, js_content: str) -> str:
-        """Modify JavaScript to use embedded JSON data instead of fetch.
-        
-        Args:
-            js_content: Original JavaScript content
-            
-        Returns:
-            Modified JavaScript content
-        """
-        # Complete replacement including initialization calls
-        fetch_replacement = '''// Load films from embedded JSON data
-async function loadFilms() {
-    try {
-        // Get embedded JSON data
-        const filmsDataElement = document.getElementById('films-data');
-        allFilms = JSON.parse(filmsDataElement.textContent);
-        
-        // Filter out past showtimes and films left with no upcoming showings
-        const __now = new Date();
-        const __startOfToday = new Date(__now.getFullYear(), __now.getMonth(), __now.getDate());
-        allFilms = allFilms
-            .map(film => {
-                if (!Array.isArray(film.showtimes)) return film;
-                const upcoming = film.showtimes.filter(st => {
-                    const dt = parseDateTime(st);
-                    if (!dt || isNaN(dt.getTime())) return true;
-                    return dt >= __startOfToday;
-                });
-                return { ...film, showtimes: upcoming };
-            })
-            .filter(film => Array.isArray(film.showtimes) && film.showtimes.length > 0);
-        
-        filteredFilms = [...allFilms];
-        
-        console.log(`🎉 Successfully loaded ${allFilms.length} films from embedded data`);
-        
-        // Extract unique cinemas and genres
-        allFilms.forEach(film => {
-            film.cinemas?.forEach(cinema => {
-                if (typeof cinema === 'string') {
-                    cinemas.add(cinema);
-                } else if (cinema?.name) {
-                    cinemas.add(cinema.name);
-                }
-            });
-            film.tmdb?.genres?.forEach(genre => genres.add(genre));
-        });
-        
-        loading.style.display = 'none';
-        
-        // Initialize display after loading data
-        setupEventListeners();
-        displayFilms(allFilms);
-        updateStats();
-        populateFilters();
-    } catch (error) {
-        console.error('Error loading films:', error);
-        loading.innerHTML = `
-            <i class="fas fa-exclamation-triangle"></i>
-            <span>Error loading films. Please try again later.</span>
-        `;
-    }
-}'''
-        
-        # Find the start and end of the loadFilms function using regex
-        
-        # Use a more robust approach to find and replace the entire function
-        # Pattern to match the comment and function start
-        start_pattern = r'(// Load films from JSON file\s*\n)?async function loadFilms\(\)\s*\{'
-        
-        # Find function start and end manually with proper brace counting
-        lines = js_content.split('\n')
-        result_lines = []
-        in_load_films = False
-        in_dom_ready = False
-        brace_count = 0
-        skip_comment = False
-        
-        for i, line in enumerate(lines):
-            # Check for the comment line before the function
-            if '// Load films from JSON file' in line:
-                skip_comment = True
-                continue
-            
-            # Check for DOMContentLoaded event listener and replace it
-            if 'document.addEventListener(\'DOMContentLoaded\', async () => {' in line:
-                in_dom_ready = True
-                brace_count = line.count('{') - line.count('}')
-                # Replace with simplified version
-                result_lines.append('// Initialize the app')
-                result_lines.append('document.addEventListener(\'DOMContentLoaded\', () => {')
-                result_lines.append('    loadFilms();')
-                result_lines.append('});')
-                continue
-            
-            if in_dom_ready:
-                # Count braces to find the end of the event listener
-                brace_count += line.count('{') - line.count('}')
-                if brace_count <= 0:
-                    # End of event listener found
-                    in_dom_ready = False
-                    # Don't add this line as it's the closing brace
-                    continue
-                else:
-                    # Skip lines inside the event listener
-                    continue
-            
-            # Check for function start
-            if 'async function loadFilms()' in line:
-                in_load_films = True
-                brace_count = line.count('{') - line.count('}')
-                # Add our replacement function
-                result_lines.append(fetch_replacement)
-                continue
-            
-            if in_load_films:
-                # Count braces to find the end of the function
-                brace_count += line.count('{') - line.count('}')
-                if brace_count <= 0:
-                    # End of function found
-                    in_load_films = False
-                    # Don't add this line as it's the closing brace
-                    continue
-                else:
-                    # Skip lines inside the function
-                    continue
-            else:
-                # Add lines outside the function (unless it's the skipped comment)
-                if not (skip_comment and line.strip() == ''):
-                    result_lines.append(line)
-                skip_comment = False
-        
-        return '\n'.join(result_lines)
+        head_end = html_content.find(b'</head>')
+        body_end = html_content.rfind(b'</body>')
+        first_script = html_content.find(b'<script>')
+        css_link = html_content.find(css_link_pattern)
+        js_link = html_content.find(js_link_pattern)
+        
+        # (start, end, replacement) splices; list order breaks ties at equal offsets
+        splices = []
+        if css_link != -1:
+            splices.append((css_link, css_link + len(css_link_pattern), css_embed))
+        elif head_end != -1:
+            splices.append((head_end, head_end, f'    {css_embed}\n'))
+        
+        if first_script != -1:
+            splices.append((first_script, first_script, f'    {json_script}\n    '))
+        elif body_end != -1:
+            splices.append((body_end, body_end, f'    {json_script}\n'))
+        
+        if js_link != -1:
+            splices.append((js_link, js_link + len(js_link_pattern), js_embed))
+        elif body_end != -1:
+            splices.append((body_end, body_end, f'    {js_embed}\n'))
+        
+        template = memoryview(html_content)
+        parts = []
+        position = 0
+        for start, end, replacement in sorted(splices, key=lambda splice: splice[0]):
+            parts.append(template[position:start])
+            parts.append(replacement.encode('utf-8'))
+            position = end
+        parts.append(template[position:])
+        return b''.join(parts)
     
     def generate_static_html(self, 
                            html_file: str = "templates/index_template.html",
                            css_file: str = "assets/styles.css", 
                            js_file: str = "assets/script.js",
                            json_file: str = "data/films_with_english_subs.json",
-                           output_file: str = "films_static.html") -> None:
+                           output_file: str = "films_static.html",
+                           minify: bool = True) -> None:
         """Generate a static HTML file with all assets embedded.
         
         Args:
@@ -438,6 +344,7 @@ async function loadFilms() {
             js_file: JavaScript file to embed
             json_file: JSON data file to embed
             output_file: Output static HTML file
+            minify: Minify CSS and JavaScript before embedding (requires rcssmin/rjsmin)
         """
         print(f"🔧 Generating static HTML file: {output_file}")
         print(f"📄 Base template: {html_file}")
@@ -448,28 +355,28 @@ async function loadFilms() {
         try:
             # Read all source files
             print("📖 Reading source files...")
-            html_content = self.read_file(html_file)
+            html_content = self.read_file(html_file, binary=True)
             css_content = self.read_file(css_file)
             js_content = self.read_file(js_file)
             json_content = self.load_json_data(json_file)
             
-            # Modify JavaScript to use embedded data
-            print("🔄 Modifying JavaScript for embedded data...")
-            modified_js = self.modify_javascript_for_embedded_data(js_content)
+            # script.js reads the embedded films-data element itself, so it
+            # is embedded as-is (minified when the minifiers are installed)
+            if minify and rcssmin and rjsmin:
+                print("🗜️  Minifying CSS and JavaScript...")
+                css_content = rcssmin.cssmin(css_content)
+                js_content = rjsmin.jsmin(js_content)
+            elif minify:
+                print("ℹ️  rcssmin/rjsmin not installed, embedding assets unminified")
             
             # Embed all content
-            print("🔗 Embedding CSS...")
-            static_html = self.embed_css(html_content, css_content)
-            
-            print("📊 Embedding JSON data...")
-            static_html = self.embed_json_data(static_html, json_content)
-            
-            print("📜 Embedding JavaScript...")
-            static_html = self.embed_javascript(static_html, modified_js)
+            print("🔗 Embedding CSS, JSON data and JavaScript...")
+            html_content = self._strip_embedded_assets(html_content)
+            static_html = self._assemble_static(html_content, css_content, json_content, js_content)
             
             # Write output file
             print(f"💾 Writing static file: {output_file}")
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with open(output_file, 'wb') as f:
                 f.write(static_html)
             
             # Get file size for user info
@@ -603,9 +510,21 @@ Default Files:
         help='Check multi-source website setup (loads from multiple JSON files)'
     )
     
+    parser.add_argument(
+        '--no-minify',
+        action='store_true',
+        help='Embed CSS and JavaScript as-is instead of minifying them'
+    )
+    
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print every multi-cinema merge instead of a single summary line'
+    )
+    
     args = parser.parse_args()
     
-    generator = StaticHTMLGenerator()
+    generator = StaticHTMLGenerator(verbose=args.verbose)
     
     if args.check_files:
         print("🔍 Checking required files...")
@@ -637,7 +556,8 @@ Default Files:
             css_file=args.css,
             js_file=args.js,
             json_file=args.json,
-            output_file=args.output
+            output_file=args.output,
+            minify=not args.no_minify
         )
     except Exception as e:
         print(f"\n❌ Failed to generate static HTML: {e}")
@@ -6,30 +6,197 @@ This script reads a JSON file containing film data and enriches it with informat
 from The Movie Database (TMDb) API, including ratings, genres, and additional metadata.
 """
 
+import asyncio
 import json
+import logging
+import logging.handlers
+import mmap
 import os
+import queue
 import re
+import sys
 import argparse
-from typing import Dict, List, Optional, Any
+from collections import defaultdict
+from contextlib import nullcontext
+from operator import itemgetter
+from typing import BinaryIO, Dict, List, Optional, Any, Set, Tuple
 import httpx
 from dotenv import load_dotenv
 
+from http_helpers import RateLimiter, SQLiteCache, send_with_retry
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
+
+# Read TMDB_API_KEY from a local .env once, rather than per enricher instance
+load_dotenv()
+
+# Parses str or bytes; TMDb responses are decoded straight from the raw body
+_json_loads = orjson.loads if orjson else json.loads
+
+logger = logging.getLogger("tmdb_enricher")
+
+# Movie details are always fetched with credits and external IDs appended, so
+# director matching and enrichment share a single request per movie
+MOVIE_DETAILS_PARAMS = {"append_to_response": "credits,external_ids"}
+
+# Returned by get_tmdb_movie_details when TMDb answers 304 Not Modified
+_NOT_MODIFIED = object()
+
+# Title cleaning patterns, compiled once (see TMDbEnricher.clean_title_for_search).
+# The "Originaltitel:" and event prefixes are stripped in one anchored match.
+_PREFIX_RE = re.compile(
+    r'^(?:Originaltitel:\s*)?'
+    r'(?:(?:Frukostbio|Musikal|Singalong|Sing[- ]?along|Studio Ghibli|'
+    r'Filmklubb|Klassiker|Special|Premi[äa]r|Sneak Peek|Kortfilm|'
+    r'Matin[ée]|Bio Bistro|Babybio|Seniorbio|Skolbio|Filmfest(?:ival)?|'
+    r'Dokument(?:är)?):\s*)?',
+    re.IGNORECASE,
+)
+_QA_SUFFIX_RE = re.compile(
+    r'\s*[+&]\s*(?:Q\s*&\s*A|samtal|introduktion|f[öo]rel[äa]sning)\b.*$',
+    re.IGNORECASE,
+)
+_MED_PERSON_RE = re.compile(r'\s+med\s+[A-ZÅÄÖ][^()]*$')
+_SUBTITLE_NOTE_RE = re.compile(
+    r'\s*[-–—|:]\s*(?:english subtitles|eng(?:lish)? subs?|'
+    r'engelska undertexter|with eng(?:lish)? subs?|en text|'
+    r'svensk text|swedish subtitles)\s*$',
+    re.IGNORECASE,
+)
+_PARENS_RE = re.compile(r'\s*\([^)]*\)')
+
+# Movie detail fields copied into film['tmdb'], extracted in one call
+_TMDB_FIELDS = ('id', 'title', 'overview', 'release_date', 'vote_average', 'vote_count',
+                'poster_path', 'backdrop_path', 'imdb_id', 'runtime', 'budget', 'revenue')
+_TMDB_DEFAULTS = dict.fromkeys(_TMDB_FIELDS)
+_get_tmdb_fields = itemgetter(*_TMDB_FIELDS)
+_get_name = itemgetter('name')
+
+# TMDb image URL prefixes; stored poster/backdrop paths are appended directly
+_POSTER_BASE = "https://image.tmdb.org/t/p/w500"
+_BACKDROP_BASE = "https://image.tmdb.org/t/p/w1280"
+
+# Year patterns used by TMDbEnricher._extract_year_from_film
+_RELEASE_YEAR_RE = re.compile(r'(\d{4})')
+_TITLE_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+
+
+def _load_json_file(path: str) -> Any:
+    """Parse a JSON file, letting orjson read it straight from a memory map."""
+    with open(path, 'rb') as f:
+        if orjson is None or not os.fstat(f.fileno()).st_size:
+            return _json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return orjson.loads(memoryview(mm))
+
+
+def _dump_json_line(obj: Any) -> bytes:
+    """Serialize ``obj`` as one UTF-8 JSON line."""
+    if orjson:
+        return orjson.dumps(obj) + b'\n'
+    return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _load_progress(path: str) -> Dict[Any, Any]:
+    """Read the films recorded in a progress file left by an earlier run.
+    
+    A line cut short by a crash is dropped from the file, so that new
+    lines can be appended after the complete ones.
+    
+    Args:
+        path: Progress file written with ``--progress-jsonl``
+        
+    Returns:
+        The ``tmdb`` value of every recorded film, keyed by ``film_id``
+    """
+    with open(path, 'rb+') as f:
+        data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            f.truncate(complete)
+    done = {}
+    for line in data[:complete].splitlines():
+        film = _json_loads(line)
+        if film.get('film_id') is not None:
+            done[film['film_id']] = film.get('tmdb')
+    return done
+
+
 class TMDbEnricher:
     """Enriches film data with information from The Movie Database API."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, concurrency: int = 8,
+                 cache_path: Optional[str] = ".tmdb_cache.sqlite3", rate_limit: float = 40.0,
+                 cache_ttl: float = 1800.0):
         """Initialize the TMDb enricher.
         
         Args:
             api_key: TMDb API key. If not provided, will try to load from environment.
+            concurrency: Maximum number of films enriched at the same time.
+            cache_path: SQLite file for caching TMDb responses. None disables caching.
+            rate_limit: Maximum TMDb requests per second. 0 disables the limit.
+            cache_ttl: Seconds a cached TMDb response is reused, across runs.
         """
-        load_dotenv()
         self.api_key = api_key or os.getenv('TMDB_API_KEY')
         self.base_url = "https://api.themoviedb.org/3"
         
         if not self.api_key:
-            print("⚠️  Warning: No TMDb API key found. Set TMDB_API_KEY environment variable.")
-            print("   TMDb enrichment will be skipped.")
+            logger.warning("⚠️  Warning: No TMDb API key found. Set TMDB_API_KEY environment variable.")
+            logger.warning("   TMDb enrichment will be skipped.")
+        
+        self.concurrency = max(1, concurrency)
+        # Pooled HTTP/2 client shared by all requests of a run; opened by
+        # ``async with enricher`` (as _enrich_all does) inside the event loop
+        # that uses it
+        self.client: Optional[httpx.AsyncClient] = None
+        self.cache = SQLiteCache(cache_path, ttl=cache_ttl) if cache_path else None
+        self.limiter = RateLimiter(rate_limit)
+        # In-process memo of GET requests for the current run, so repeated
+        # lookups (e.g. the same director across many films) share one request
+        self._requests: Dict[str, asyncio.Future] = {}
+        # TMDb genre ID -> name, loaded when films are built from search results only
+        self._genre_names: Dict[int, str] = {}
+    
+    async def __aenter__(self) -> "TMDbEnricher":
+        """Open the TMDb client, e.g. to call enrich_film or search_tmdb_movie directly."""
+        self._requests = {}
+        self.client = self._new_client()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the TMDb client and forget the requests made with it."""
+        await self.client.aclose()
+        self.client = None
+        self._requests = {}
+    
+    def _require_client(self) -> None:
+        """Fail clearly when a TMDb lookup is made without an open client.
+        
+        Raises:
+            RuntimeError: If called outside ``async with enricher``
+        """
+        if self.client is None:
+            raise RuntimeError(
+                "TMDbEnricher has no open HTTP client; use 'async with enricher:' "
+                "around direct calls to its async lookup methods"
+            )
+    
+    def _new_client(self) -> httpx.AsyncClient:
+        """Create the pooled async client used for all TMDb requests.
+        
+        The API key and response language are sent as default query
+        parameters, so individual requests only pass what is specific to them.
+        """
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            params={"api_key": self.api_key, "language": "en-US"} if self.api_key else None,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            http2=True,
+        )
         
     def clean_title_for_search(self, title: str) -> str:
         """Clean film title for better TMDb search results.
@@ -48,46 +215,27 @@ class TMDbEnricher:
         """
         cleaned = title or ""
 
-        # 1. Strip "Originaltitel:" prefix.
-        cleaned = re.sub(r'^Originaltitel:\s*', '', cleaned, flags=re.IGNORECASE)
-
-        # 2. Strip common Swedish event/series prefixes ending in ":".
-        prefix_words = (
-            r'Frukostbio|Musikal|Singalong|Sing[- ]?along|Studio Ghibli|'
-            r'Filmklubb|Klassiker|Special|Premi[äa]r|Sneak Peek|Kortfilm|'
-            r'Matin[ée]|Bio Bistro|Babybio|Seniorbio|Skolbio|Filmfest(?:ival)?|'
-            r'Dokument(?:är)?'
-        )
-        cleaned = re.sub(rf'^(?:{prefix_words}):\s*', '', cleaned, flags=re.IGNORECASE)
+        # 1-2. Strip the "Originaltitel:" prefix and common Swedish
+        #      event/series prefixes ending in ":".
+        #      The pattern is fully optional, so it always matches at the start.
+        cleaned = cleaned[_PREFIX_RE.match(cleaned).end():]
 
         # 3. Strip "+ Q&A ..." or "+ samtal ..." style additions.
-        cleaned = re.sub(
-            r'\s*[+&]\s*(?:Q\s*&\s*A|samtal|introduktion|f[öo]rel[äa]sning)\b.*$',
-            '',
-            cleaned,
-            flags=re.IGNORECASE,
-        )
+        cleaned = _QA_SUFFIX_RE.sub('', cleaned)
 
         # 4. Strip "med <person>" suffix (e.g. "Hellraiser med Per Faxneld").
-        cleaned = re.sub(r'\s+med\s+[A-ZÅÄÖ][^()]*$', '', cleaned)
+        cleaned = _MED_PERSON_RE.sub('', cleaned)
 
         # 5. Strip subtitle-language notes attached to the title.
-        cleaned = re.sub(
-            r'\s*[-–—|:]\s*(?:english subtitles|eng(?:lish)? subs?|'
-            r'engelska undertexter|with eng(?:lish)? subs?|en text|'
-            r'svensk text|swedish subtitles)\s*$',
-            '',
-            cleaned,
-            flags=re.IGNORECASE,
-        )
+        cleaned = _SUBTITLE_NOTE_RE.sub('', cleaned)
 
         # 6. Drop all parenthesised notes — the year is already passed to
         #    TMDb as a separate `year` parameter via `_extract_year_from_film`.
-        cleaned = re.sub(r'\s*\([^)]*\)', '', cleaned)
+        cleaned = _PARENS_RE.sub('', cleaned)
 
         # 7. Collapse whitespace.
         cleaned = ' '.join(cleaned.split())
-        return cleaned.strip() or (title or '').strip()
+        return cleaned or (title or '').strip()
     
     def _extract_year_from_film(self, film: Dict[str, Any]) -> Optional[str]:
         """Extract release year from film data, if available.
@@ -106,8 +254,6 @@ class TMDbEnricher:
         Returns:
             Year as string or None if not found
         """
-        import re
-
         # Explicit year fields.
         for key in ('year', 'releaseYear', 'release_year'):
             value = film.get(key)
@@ -116,19 +262,104 @@ class TMDbEnricher:
 
         release_date = film.get('release_date') or film.get('releaseDate')
         if isinstance(release_date, str):
-            m = re.match(r'(\d{4})', release_date)
+            m = _RELEASE_YEAR_RE.match(release_date)
             if m:
                 return m.group(1)
 
         # 4-digit year embedded in the title.
         title = film.get('title', '')
-        year_match = re.search(r'\b(19|20)\d{2}\b', title)
+        year_match = _TITLE_YEAR_RE.search(title)
         if year_match:
             return year_match.group(0)
 
         return None
     
-    def search_tmdb_movie(self, title: str, director: str = None, year: str = None) -> Optional[Dict[str, Any]]:
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None,
+                   etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """GET a TMDb endpoint and return its JSON body.
+        
+        Identical requests within a run are issued once and shared; results
+        are also served from the on-disk response cache when fresh. Callers
+        must treat the returned data as read-only.
+        
+        Args:
+            path: API path relative to the base URL
+            params: Query parameters (API key and language are added by the client)
+            etag: ETag from an earlier response; makes the request conditional
+                unless the response is already known in this run or cached
+            
+        Returns:
+            Decoded JSON response, or None if ``etag`` was given and TMDb
+            reports the resource unchanged
+            
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        params = params or {}
+        key = self._request_key(path, params)
+        request = self._requests.get(key)
+        if request is None:
+            # Conditional requests are only shared with identical ones
+            memo_key = json.dumps([key, etag]) if etag else key
+            request = self._requests.get(memo_key)
+            if request is None:
+                request = asyncio.ensure_future(self._fetch(key, path, params, etag))
+                self._requests[memo_key] = request
+        return await request
+    
+    @staticmethod
+    def _request_key(path: str, params: Dict[str, Any]) -> str:
+        """Key identifying a GET request in the run memo and response cache."""
+        return json.dumps([path, sorted(params.items())])
+    
+    async def _fetch(self, key: str, path: str, params: Dict[str, Any],
+                     etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Fetch ``path`` from the response cache or TMDb and cache the result."""
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = await self._send(path, params, headers={"If-None-Match": etag} if etag else None)
+        if etag and response.status_code == 304:
+            return None
+        response.raise_for_status()
+        return self._store(key, response)
+    
+    async def _send(self, path: str, params: Dict[str, Any],
+                    headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """Send a rate-limited GET, retrying rate limits and transient failures.
+        
+        See http_helpers.send_with_retry; any response that is not retried
+        (including 404) is returned as-is.
+        
+        Args:
+            path: API path relative to the base URL
+            params: Query parameters (API key and language are added by the client)
+            headers: Extra request headers
+            
+        Returns:
+            The final response
+            
+        Raises:
+            httpx.TransportError: If the last attempt fails to connect
+        """
+        return await send_with_retry(
+            lambda: self.client.get(path, params=params, headers=headers),
+            self.limiter, path, logger.warning)
+    
+    def _store(self, key: str, response: httpx.Response) -> Dict[str, Any]:
+        """Decode a successful response, keeping its ETag, and cache it."""
+        data = _json_loads(response.content)
+        etag = response.headers.get('etag')
+        if etag:
+            data['_etag'] = etag
+        
+        if self.cache is not None:
+            self.cache.set(key, data)
+        return data
+    
+    async def search_tmdb_movie(self, title: str, director: str = None, year: str = None) -> Optional[Dict[str, Any]]:
         """Search for a movie on TMDb using title and optionally year, then filter by director.
         
         Args:
@@ -139,82 +370,77 @@ class TMDbEnricher:
         Returns:
             Movie data from TMDb API or None if not found
         """
+        self._require_client()
         if not self.api_key:
             return None
             
         try:
             # Step 1: Search for movie by title (and year if available)
-            search_params = {
-                "api_key": self.api_key,
-                "query": title,
-                "language": "en-US"
-            }
+            search_params = {"query": title}
             
             if year:
                 search_params["year"] = year
-                print(f"  🔍 Searching TMDb: '{title}' ({year})")
+                logger.info(f"  🔍 Searching TMDb: '{title}' ({year})")
             else:
-                print(f"  🔍 Searching TMDb: '{title}'")
-                
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/search/movie",
-                    params=search_params,
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
+                logger.info(f"  🔍 Searching TMDb: '{title}'")
                 
-                if not data.get('results'):
-                    print(f"  ❌ No TMDb results found for '{title}'")
-                    return None
+            data = await self._get("/search/movie", search_params)
+            
+            if not data.get('results'):
+                logger.info(f"  ❌ No TMDb results found for '{title}'")
+                return None
+            
+            results = data['results']
+            logger.info(f"  📋 Found {len(results)} potential matches")
+            
+            # Step 2: If we have multiple results and a director, try director filmography search
+            if len(results) > 1 and director and director.strip():
+                logger.info(f"  🔄 Multiple results found, searching director's filmography...")
                 
-                results = data['results']
-                print(f"  📋 Found {len(results)} potential matches")
+                # Search for director and look through their filmography
+                director_data = await self.search_tmdb_director(director)
+                known_movie_ids = set()
+                if director_data:
+                    known_movie_ids = {
+                        known['id'] for known in director_data.get('known_for', [])
+                        if known.get('media_type') == 'movie' and known.get('id')
+                    }
+                    director_id = director_data.get('id')
+                    if director_id:
+                        filmography_match = await self.search_in_director_filmography(director_id, title, year)
+                        if filmography_match:
+                            return filmography_match
+                        else:
+                            logger.info(f"  🔄 No filmography match, falling back to credits-based search")
                 
-                # Step 2: If we have multiple results and a director, try director filmography search
-                if len(results) > 1 and director and director.strip():
-                    print(f"  🔄 Multiple results found, searching director's filmography...")
-                    
-                    # Search for director and look through their filmography
-                    director_data = self.search_tmdb_director(director)
-                    if director_data:
-                        director_id = director_data.get('id')
-                        if director_id:
-                            filmography_match = self.search_in_director_filmography(director_id, title, year)
-                            if filmography_match:
-                                return filmography_match
-                            else:
-                                print(f"  🔄 No filmography match, falling back to credits-based search")
-                    
-                    # Fallback: use original credits-based method
-                    print(f"  🎭 Filtering by director credits: '{director}'")
-                    best_match = self._find_best_match_by_director(results, director)
-                    if best_match:
-                        return best_match
-                    else:
-                        print(f"  ⚠️  No director match found, using first result")
-                        return results[0]
-                        
-                elif director and director.strip():
-                    # Single result but we have director - still validate with credits
-                    print(f"  🎭 Validating single result with director: '{director}'")
-                    best_match = self._find_best_match_by_director(results, director)
-                    if best_match:
-                        return best_match
-                    else:
-                        print(f"  ⚠️  Director validation failed, using result anyway")
-                        return results[0]
+                # Fallback: use original credits-based method
+                logger.info(f"  🎭 Filtering by director credits: '{director}'")
+                best_match = await self._find_best_match_by_director(results, director, known_movie_ids)
+                if best_match:
+                    return best_match
                 else:
-                    # No director to match against, return first result
+                    logger.warning(f"  ⚠️  No director match found, using first result")
                     return results[0]
                     
+            elif director and director.strip():
+                # Single result but we have director - still validate with credits
+                logger.info(f"  🎭 Validating single result with director: '{director}'")
+                best_match = await self._find_best_match_by_director(results, director)
+                if best_match:
+                    return best_match
+                else:
+                    logger.warning(f"  ⚠️  Director validation failed, using result anyway")
+                    return results[0]
+            else:
+                # No director to match against, return first result
+                return results[0]
+                
         except Exception as e:
-            print(f"  ❌ TMDb search error for '{title}': {e}")
+            logger.error(f"  ❌ TMDb search error for '{title}': {e}")
             
         return None
 
-    def search_tmdb_director(self, director_name: str) -> Optional[Dict[str, Any]]:
+    async def search_tmdb_director(self, director_name: str) -> Optional[Dict[str, Any]]:
         """Search for a director by name on TMDb.
         
         Args:
@@ -223,53 +449,43 @@ class TMDbEnricher:
         Returns:
             Director data from TMDb API or None if not found
         """
+        self._require_client()
         if not self.api_key or not director_name:
             return None
             
         try:
-            search_params = {
-                "api_key": self.api_key,
-                "query": director_name,
-                "language": "en-US"
-            }
+            search_params = {"query": ' '.join(director_name.split())}
             
-            print(f"  🎭 Searching for director: '{director_name}'")
+            logger.info(f"  🎭 Searching for director: '{director_name}'")
             
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/search/person",
-                    params=search_params,
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data.get('results'):
-                    print(f"  ❌ No director found for '{director_name}'")
-                    return None
-                
-                # Look for directors (not actors)
-                directors = [person for person in data['results'] 
-                           if person.get('known_for_department') == 'Directing']
-                
-                if not directors:
-                    # Fallback: use first person if no explicit directors found
-                    directors = data['results']
+            data = await self._get("/search/person", search_params)
+            
+            if not data.get('results'):
+                logger.info(f"  ❌ No director found for '{director_name}'")
+                return None
+            
+            # Look for directors (not actors)
+            directors = [person for person in data['results'] 
+                       if person.get('known_for_department') == 'Directing']
+            
+            if not directors:
+                # Fallback: use first person if no explicit directors found
+                directors = data['results']
+            
+            if directors:
+                director = directors[0]
+                logger.info(f"  ✅ Found director: {director.get('name')} (ID: {director.get('id')})")
+                return director
+            else:
+                logger.info(f"  ❌ No suitable director found for '{director_name}'")
+                return None
                 
-                if directors:
-                    director = directors[0]
-                    print(f"  ✅ Found director: {director.get('name')} (ID: {director.get('id')})")
-                    return director
-                else:
-                    print(f"  ❌ No suitable director found for '{director_name}'")
-                    return None
-                    
         except Exception as e:
-            print(f"  ❌ Error searching for director '{director_name}': {e}")
+            logger.error(f"  ❌ Error searching for director '{director_name}': {e}")
             
         return None
 
-    def search_in_director_filmography(self, director_id: int, movie_title: str, year: str = None) -> Optional[Dict[str, Any]]:
+    async def search_in_director_filmography(self, director_id: int, movie_title: str, year: str = None) -> Optional[Dict[str, Any]]:
         """Search for a movie in director's filmography.
         
         Args:
@@ -280,202 +496,233 @@ class TMDbEnricher:
         Returns:
             Movie data from director's filmography or None if not found
         """
+        self._require_client()
         if not self.api_key or not director_id:
             return None
             
         try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/person/{director_id}/movie_credits",
-                    params={"api_key": self.api_key},
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                crew_movies = data.get('crew', [])
-                # Filter for movies where this person was director
-                directed_movies = [movie for movie in crew_movies 
-                                 if movie.get('job') == 'Director']
-                
-                print(f"  🎬 Found {len(directed_movies)} movies directed by this person")
-                
-                if not directed_movies:
-                    return None
+            data = await self._get(f"/person/{director_id}/movie_credits")
+            
+            crew_movies = data.get('crew', [])
+            # Filter for movies where this person was director (TMDb always sets 'job')
+            directed_movies = [movie for movie in crew_movies if movie['job'] == 'Director']
+            
+            logger.info(f"  🎬 Found {len(directed_movies)} movies directed by this person")
+            
+            if not directed_movies:
+                return None
+            
+            # Clean the search title for comparison; its word set is the same
+            # for every candidate, so build it once
+            clean_search_title = self.clean_title_for_search(movie_title).casefold()
+            search_words = set(clean_search_title.split())
+            search_word_count = max(len(search_words), 1)
+            
+            # Normalize candidate titles once, in lists parallel to directed_movies
+            titles_lc = [movie.get('title', '').casefold() for movie in directed_movies]
+            originals_lc = [movie.get('original_title', '').casefold() for movie in directed_movies]
+            
+            # Look for exact or close matches
+            best_match = None
+            best_score = 0
+            
+            for movie, tmdb_title, original_title in zip(directed_movies, titles_lc, originals_lc):
+                # Calculate match score
+                score = 0
                 
-                # Clean the search title for comparison
-                clean_search_title = self.clean_title_for_search(movie_title).lower()
+                # Exact title match gets highest score
+                if clean_search_title == tmdb_title or clean_search_title == original_title:
+                    score = 100
+                # Partial match
+                elif (clean_search_title in tmdb_title or tmdb_title in clean_search_title or
+                      clean_search_title in original_title or original_title in clean_search_title):
+                    score = 50
+                # Word overlap
+                else:
+                    title_overlap = len(search_words.intersection(tmdb_title.split())) / search_word_count
+                    original_overlap = len(search_words.intersection(original_title.split())) / search_word_count
+                    max_overlap = max(title_overlap, original_overlap)
+                    
+                    if max_overlap > 0.5:  # At least 50% word overlap
+                        score = int(max_overlap * 30)
                 
-                # Look for exact or close matches
-                best_match = None
-                best_score = 0
+                # Year bonus
+                if year and movie.get('release_date'):
+                    movie_year = movie['release_date'][:4]
+                    if movie_year == year:
+                        score += 20
                 
-                for movie in directed_movies:
-                    tmdb_title = movie.get('title', '').lower()
-                    original_title = movie.get('original_title', '').lower()
-                    
-                    # Calculate match score
-                    score = 0
-                    
-                    # Exact title match gets highest score
-                    if clean_search_title == tmdb_title or clean_search_title == original_title:
-                        score = 100
-                    # Partial match
-                    elif (clean_search_title in tmdb_title or tmdb_title in clean_search_title or
-                          clean_search_title in original_title or original_title in clean_search_title):
-                        score = 50
-                    # Word overlap
-                    else:
-                        search_words = set(clean_search_title.split())
-                        title_words = set(tmdb_title.split())
-                        original_words = set(original_title.split())
-                        
-                        title_overlap = len(search_words & title_words) / max(len(search_words), 1)
-                        original_overlap = len(search_words & original_words) / max(len(search_words), 1)
-                        max_overlap = max(title_overlap, original_overlap)
-                        
-                        if max_overlap > 0.5:  # At least 50% word overlap
-                            score = int(max_overlap * 30)
-                    
-                    # Year bonus
-                    if year and movie.get('release_date'):
-                        movie_year = movie['release_date'][:4]
-                        if movie_year == year:
-                            score += 20
-                    
-                    if score > best_score and score >= 30:  # Minimum threshold
-                        best_score = score
-                        best_match = movie
-                        
-                if best_match:
-                    print(f"  ✅ Found match in filmography: '{best_match.get('title')}' (score: {best_score})")
-                    return best_match
-                else:
-                    print(f"  ❌ No matching movie found in director's filmography")
-                    return None
+                if score > best_score and score >= 30:  # Minimum threshold
+                    best_score = score
+                    best_match = movie
                     
+            if best_match:
+                logger.info(f"  ✅ Found match in filmography: '{best_match.get('title')}' (score: {best_score})")
+                return best_match
+            else:
+                logger.info(f"  ❌ No matching movie found in director's filmography")
+                return None
+                
         except Exception as e:
-            print(f"  ❌ Error searching director's filmography: {e}")
+            logger.error(f"  ❌ Error searching director's filmography: {e}")
             
         return None
     
-    def _find_best_match_by_director(self, results: List[Dict[str, Any]], director: str) -> Optional[Dict[str, Any]]:
+    async def _find_best_match_by_director(self, results: List[Dict[str, Any]], director: str,
+                                           known_movie_ids: Optional[Set[int]] = None) -> Optional[Dict[str, Any]]:
         """Find the best movie match based on director information.
         
         Args:
             results: List of TMDb search results
             director: Director name to match against
+            known_movie_ids: IDs from the director's ``known_for`` list; a result
+                in this set is accepted without fetching any credits
             
         Returns:
             Best matching movie or None
         """
         if not director:
             return None
+        
+        if known_movie_ids:
+            for movie in results:
+                if movie.get('id') in known_movie_ids:
+                    logger.info(f"  ✅ Matched director via known films: '{movie.get('title')}'")
+                    return movie
             
-        director_lower = director.lower().strip()
+        # Normalize the film's director once for every crew comparison
+        director_cf = director.strip().casefold()
+        if not director_cf:
+            return None
+        director_last = director_cf.split()[-1]
+        candidates = [movie for movie in results if movie.get('id')]
         
-        for movie in results:
-            movie_id = movie.get('id')
-            if not movie_id:
-                continue
-                
-            try:
-                # Get movie credits to check director
-                with httpx.Client() as client:
-                    credits_response = client.get(
-                        f"{self.base_url}/movie/{movie_id}/credits",
-                        params={"api_key": self.api_key},
-                        timeout=10.0
-                    )
-                    credits_response.raise_for_status()
-                    credits_data = credits_response.json()
-                    
-                    # Check if any director matches
-                    crew = credits_data.get('crew', [])
-                    for person in crew:
-                        if person.get('job') == 'Director':
-                            tmdb_director = person.get('name', '').lower().strip()
-                            
-                            # Check for exact match or partial match
-                            if (director_lower in tmdb_director or 
-                                tmdb_director in director_lower or
-                                director_lower.split()[-1] in tmdb_director):  # Last name match
-                                print(f"  ✅ Matched director: '{director}' ≈ '{person.get('name')}'")
-                                return movie
-                                
-            except Exception as e:
-                print(f"  ⚠️  Error checking director for movie ID {movie_id}: {e}")
+        # Fetch all candidates' details (with credits appended) at once, then
+        # scan in ranking order; the chosen movie's details are reused later
+        all_details = await asyncio.gather(
+            *(self._get(f"/movie/{movie['id']}", MOVIE_DETAILS_PARAMS) for movie in candidates),
+            return_exceptions=True
+        )
+        
+        for movie, details in zip(candidates, all_details):
+            if isinstance(details, Exception):
+                logger.warning(f"  ⚠️  Error checking director for movie ID {movie['id']}: {details}")
                 continue
+            
+            # Check if any director matches
+            crew = details.get('credits', {}).get('crew', [])
+            matched = next((person for person in crew
+                            if person.get('job') == 'Director'
+                            and self._director_name_matches(director_cf, director_last, person.get('name', ''))), None)
+            if matched:
+                logger.info(f"  ✅ Matched director: '{director}' ≈ '{matched.get('name')}'")
+                return movie
         
-        print(f"  ⚠️  No director match found for '{director}', using first result")
+        logger.warning(f"  ⚠️  No director match found for '{director}', using first result")
         return None
     
-    def get_tmdb_movie_details(self, movie_id: int) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _director_name_matches(director_cf: str, director_last: str, name: str) -> bool:
+        """Check a TMDb crew name against the (case-folded) film director.
+        
+        Args:
+            director_cf: Director from the film data, stripped and case-folded
+            director_last: Last word of ``director_cf``
+            name: Director name from TMDb credits
+            
+        Returns:
+            True on an exact, partial or last-name match
+        """
+        tmdb_director = name.strip().casefold()
+        return (director_cf in tmdb_director or
+                tmdb_director in director_cf or
+                director_last in tmdb_director)  # Last name match
+    
+    async def get_tmdb_movie_details(self, movie_id: int, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get detailed movie information from TMDb.
         
         Args:
             movie_id: TMDb movie ID
+            etag: ETag of previously stored details; makes the request conditional
             
         Returns:
-            Detailed movie data or None if error
+            Detailed movie data, ``_NOT_MODIFIED`` if the stored details are
+            still current, or None if error
         """
+        self._require_client()
         if not self.api_key:
             return None
             
         try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/movie/{movie_id}",
-                    params={
-                        "api_key": self.api_key,
-                        "language": "en-US"
-                    },
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                return response.json()
-                
+            if etag:
+                details = await self._get(f"/movie/{movie_id}", MOVIE_DETAILS_PARAMS, etag=etag)
+                return _NOT_MODIFIED if details is None else details
+            return await self._get(f"/movie/{movie_id}", MOVIE_DETAILS_PARAMS)
+            
+        except httpx.HTTPStatusError as e:
+            # 404 means the ID does not exist; callers report the missing match
+            if e.response.status_code != 404:
+                logger.error(f"  ❌ TMDb details error for movie {movie_id}: {e}")
         except Exception as e:
-            print(f"  ❌ TMDb details error for movie {movie_id}: {e}")
+            logger.error(f"  ❌ TMDb details error for movie {movie_id}: {e}")
             
         return None
     
-    def enrich_film(self, film: Dict[str, Any], force_refresh: bool = False) -> Dict[str, Any]:
+    @staticmethod
+    def _previous_etag(film: Dict[str, Any], movie_id: Any) -> Optional[str]:
+        """ETag of the film's stored TMDb details, if they are for ``movie_id``."""
+        previous = film.get('tmdb') or {}
+        if str(previous.get('id')) == str(movie_id):
+            return previous.get('_etag')
+        return None
+    
+    async def enrich_film(self, film: Dict[str, Any], force_refresh: bool = False,
+                          full: bool = True) -> Dict[str, Any]:
         """Enrich a single film with TMDb data.
         
         Args:
             film: Film data dictionary
             force_refresh: If True, refresh TMDb data even if it already exists
+            full: If False, searched films are built from the search result and
+                the genre list, skipping the details request; IMDb ID, runtime,
+                budget and revenue are then left empty
             
         Returns:
             Film data enriched with TMDb information
         """
+        self._require_client()
         if not self.api_key:
             return film
             
-        # Skip if already has TMDb data and not forcing refresh
+        # Skip if already has TMDb data and not forcing refresh (batch runs
+        # filter these out before scheduling, see _enrich_all)
         if film.get('tmdb') and not force_refresh:
-            print(f"  ℹ️  Already has TMDb data, skipping")
             return film
         elif film.get('tmdb') and force_refresh:
-            print(f"  🔄 Refreshing existing TMDb data")
+            logger.info(f"  🔄 Refreshing existing TMDb data")
             
+        # Genre names, when already resolved from genre IDs (search-only mode)
+        genre_names: Optional[List[str]] = None
+        
         # Check if manual TMDb ID is provided
         manual_tmdb_id = film.get('manual_tmdb')
         if manual_tmdb_id:
-            print(f"  🎯 Using manual TMDb ID: {manual_tmdb_id}")
+            logger.info(f"  🎯 Using manual TMDb ID: {manual_tmdb_id}")
             # Get detailed information directly with the manual ID
-            details = self.get_tmdb_movie_details(manual_tmdb_id)
-            if details:
-                print(f"  ✅ Found TMDb match: {details.get('title', 'Unknown')}")
+            details = await self.get_tmdb_movie_details(
+                manual_tmdb_id, etag=self._previous_etag(film, manual_tmdb_id))
+            if details is _NOT_MODIFIED:
+                pass
+            elif details:
+                logger.info(f"  ✅ Found TMDb match: {details.get('title', 'Unknown')}")
             else:
-                print(f"  ❌ Manual TMDb ID {manual_tmdb_id} not found")
+                logger.info(f"  ❌ Manual TMDb ID {manual_tmdb_id} not found")
                 return film
         else:
             # Use automatic search
             title = film.get('title', '')
             if not title:
-                print(f"  ⚠️  No title found, skipping TMDb enrichment")
+                logger.warning(f"  ⚠️  No title found, skipping TMDb enrichment")
                 return film
                 
             director = film.get('director', '')
@@ -485,124 +732,292 @@ class TMDbEnricher:
             year = self._extract_year_from_film(film)
             
             # Search for the movie, including director and year if available
-            search_result = self.search_tmdb_movie(clean_title, director, year)
+            search_result = await self.search_tmdb_movie(clean_title, director, year)
             
             if not search_result:
-                print(f"  🔍 No TMDb results found for: {self.clean_title_for_search(title)}")
+                logger.info(f"  🔍 No TMDb results found for: {clean_title}")
                 return film
                 
-            print(f"  ✅ Found TMDb match: {search_result.get('title', 'Unknown')}")
+            logger.info(f"  ✅ Found TMDb match: {search_result.get('title', 'Unknown')}")
             
-            # Get detailed information
-            details = self.get_tmdb_movie_details(search_result['id'])
+            if full:
+                # Get detailed information
+                details = await self.get_tmdb_movie_details(
+                    search_result['id'], etag=self._previous_etag(film, search_result['id']))
+            else:
+                details = search_result
+                known_genres = self._genre_names
+                genre_names = [known_genres[genre_id] for genre_id in search_result.get('genre_ids', ())
+                               if genre_id in known_genres]
+        
+        if details is _NOT_MODIFIED:
+            logger.info(f"  ✅ TMDb data unchanged since last refresh")
+            film['tmdb'] = dict(film['tmdb'])
+            return film
         
         if details:
+            (tmdb_id, tmdb_title, overview, release_date, vote_average, vote_count,
+             poster_path, backdrop_path, imdb_id, runtime, budget, revenue) = _get_tmdb_fields({**_TMDB_DEFAULTS, **details})
+            
             # Construct full poster and backdrop URLs
-            poster_path = details.get('poster_path')
-            backdrop_path = details.get('backdrop_path')
-            poster_url = f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else None
-            backdrop_url = f"https://image.tmdb.org/t/p/w1280{backdrop_path}" if backdrop_path else None
+            poster_url = _POSTER_BASE + poster_path if poster_path else None
+            backdrop_url = _BACKDROP_BASE + backdrop_path if backdrop_path else None
             
             # Add TMDb data to film
             film['tmdb'] = {
-                'id': details.get('id'),
-                'title': details.get('title'),
-                'overview': details.get('overview'),
-                'release_date': details.get('release_date'),
-                'rating': details.get('vote_average'),
-                'vote_count': details.get('vote_count'),
-                'genres': [genre['name'] for genre in details.get('genres', [])],
-                'poster_path': details.get('poster_path'),
+                'id': tmdb_id,
+                'title': tmdb_title,
+                'overview': overview,
+                'release_date': release_date,
+                'rating': vote_average,
+                'vote_count': vote_count,
+                'genres': (genre_names if genre_names is not None
+                           else list(map(_get_name, details.get('genres', ())))),
+                'poster_path': poster_path,
                 'poster_url': poster_url,
-                'backdrop_path': details.get('backdrop_path'),
+                'backdrop_path': backdrop_path,
                 'backdrop_url': backdrop_url,
-                'imdb_id': details.get('imdb_id'),
-                'runtime': details.get('runtime'),
-                'budget': details.get('budget'),
-                'revenue': details.get('revenue')
+                'imdb_id': imdb_id,
+                'runtime': runtime,
+                'budget': budget,
+                'revenue': revenue
             }
+            if details.get('_etag'):
+                film['tmdb']['_etag'] = details['_etag']
             
             # Display enrichment info
             if film['tmdb'].get('rating'):
-                print(f"  ⭐ TMDb Rating: {film['tmdb']['rating']}/10")
+                logger.info(f"  ⭐ TMDb Rating: {film['tmdb']['rating']}/10")
             if film['tmdb'].get('genres'):
-                print(f"  🎭 Genres: {', '.join(film['tmdb']['genres'])}")
+                logger.info(f"  🎭 Genres: {', '.join(film['tmdb']['genres'])}")
         
         return film
     
-    def enrich_films_file(self, input_file: str, output_file: Optional[str] = None, force_refresh: bool = False) -> None:
+    def _dedupe_key(self, film: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        """Key identifying films that resolve to the same TMDb lookup.
+        
+        Args:
+            film: Film data dictionary
+            
+        Returns:
+            ``('manual', id)`` or ``('search', clean title, director, year)``,
+            or None if the film has nothing to look up
+        """
+        manual_tmdb_id = film.get('manual_tmdb')
+        if manual_tmdb_id:
+            return ('manual', manual_tmdb_id)
+        title = film.get('title', '')
+        if not title:
+            return None
+        return ('search', self.clean_title_for_search(title), film.get('director', ''),
+                self._extract_year_from_film(film))
+    
+    async def _warm_connection(self) -> None:
+        """Open the connection to TMDb ahead of the first real request.
+        
+        DNS resolution and the TLS handshake happen here, so the enrichment
+        tasks all start on one warm HTTP/2 connection. Failures are ignored;
+        the real requests will surface any problem.
+        """
+        if not self.api_key:
+            return
+        try:
+            await self.client.get("/configuration", timeout=5.0)
+        except Exception:
+            pass
+    
+    async def _load_genre_names(self) -> None:
+        """Fetch TMDb's movie genre list for building films from search results."""
+        try:
+            data = await self._get("/genre/movie/list")
+            self._genre_names = {genre['id']: genre['name'] for genre in data.get('genres', [])}
+        except Exception as e:
+            logger.warning(f"⚠️  Could not load TMDb genre list: {e}")
+    
+    async def _enrich_all(self, films: List[Dict[str, Any]], force_refresh: bool,
+                          full: bool = True, progress: Optional[BinaryIO] = None,
+                          resumed: Optional[Set[Any]] = None) -> Tuple[int, int, int, int]:
+        """Enrich all films, keeping at most ``self.concurrency`` in flight.
+        
+        Args:
+            films: Film data dictionaries, updated in place
+            force_refresh: If True, refresh TMDb data even if it already exists
+            full: If False, skip the details request for searched films
+            progress: Binary file that each film is appended to as a JSON line
+                once it has been processed
+            resumed: IDs of films already processed by an interrupted run,
+                which are not enriched again
+            
+        Returns:
+            Tuple of (newly enriched count, refreshed count, count of refreshed
+            films whose TMDb data was unchanged, total with TMDb data)
+        """
+        enriched_count = 0
+        refreshed_count = 0
+        unchanged_count = 0
+        started_count = 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        # Films that keep their existing TMDb data are never scheduled
+        resumed = resumed or set()
+        remaining = [(i, film) for i, film in enumerate(films, 1)
+                     if film.get('film_id') not in resumed]
+        pending = [(i, film) for i, film in remaining
+                   if force_refresh or not film.get('tmdb')]
+        if len(remaining) > len(pending):
+            logger.info(f"ℹ️  Skipping {len(remaining) - len(pending)} films that already have TMDb data")
+        scheduled = {i for i, _ in pending}
+        total_with_tmdb = sum(1 for i, film in enumerate(films, 1)
+                              if i not in scheduled and film.get('tmdb'))
+        
+        # Films resolving to the same lookup (e.g. repeat screenings) are
+        # enriched once and the result is copied to the rest of the group
+        groups: Dict[Any, List[Tuple[int, Dict[str, Any]]]] = defaultdict(list)
+        for i, film in pending:
+            key = self._dedupe_key(film)
+            groups[key if key is not None else ('film', i)].append((i, film))
+        
+        async def bounded(members: List[Tuple[int, Dict[str, Any]]]) -> None:
+            nonlocal enriched_count, refreshed_count, unchanged_count, total_with_tmdb, started_count
+            async with semaphore:
+                i, film = members[0]
+                film_id = film.get('film_id', f'film_{i}')
+                started_count += 1
+                logger.info(f"🎭 Processing film {started_count}/{len(groups)}: {film_id}")
+                
+                original_tmdb = [member.get('tmdb') for _, member in members]
+                previous_tmdb = film.get('tmdb')
+                await self.enrich_film(film, force_refresh=force_refresh, full=full)
+                
+                # Only share data that was fetched in this run
+                if len(members) > 1 and film.get('tmdb') is not previous_tmdb:
+                    for _, duplicate in members[1:]:
+                        duplicate['tmdb'] = dict(film['tmdb'])
+                    logger.info(f"  ♻️  Reused TMDb data for {len(members) - 1} duplicate(s)")
+                
+                for (_, member), old_tmdb in zip(members, original_tmdb):
+                    new_tmdb = member.get('tmdb')
+                    if new_tmdb:
+                        total_with_tmdb += 1
+                        if old_tmdb is None:
+                            enriched_count += 1
+                        elif force_refresh:
+                            refreshed_count += 1
+                            # Re-fetched (or confirmed by a 304) with identical content
+                            if new_tmdb is not old_tmdb and new_tmdb == old_tmdb:
+                                unchanged_count += 1
+                
+                if progress is not None:
+                    progress.write(b''.join(_dump_json_line(member) for _, member in members))
+        
+        grouped_films = list(groups.values())
+        async with self:
+            await self._warm_connection()
+            if not full:
+                await self._load_genre_names()
+            tasks = [asyncio.create_task(bounded(members)) for members in grouped_films]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        if self.cache is not None:
+            self.cache.flush()
+        
+        for members, result in zip(grouped_films, results):
+            if isinstance(result, Exception):
+                logger.error(f"  ❌ Error enriching '{members[0][1].get('title', 'Unknown')}': {result}")
+                total_with_tmdb += sum(1 for _, member in members if member.get('tmdb'))
+        
+        return enriched_count, refreshed_count, unchanged_count, total_with_tmdb
+    
+    def enrich_films_file(self, input_file: str, output_file: Optional[str] = None, force_refresh: bool = False,
+                          full: bool = True, progress_jsonl: bool = False) -> None:
         """Enrich films in a JSON file with TMDb data.
         
         Args:
             input_file: Path to input JSON file
             output_file: Path to output JSON file. If None, overwrites input file.
             force_refresh: If True, refresh all TMDb data even if it already exists.
+            full: If False, build searched films from search results only (one
+                request fewer per film, without IMDb ID/runtime/budget/revenue).
+            progress_jsonl: If True, write each processed film to
+                ``<output>.jsonl`` as it finishes, so a crashed run keeps its
+                progress. If the file is already there, the films recorded in
+                it get their TMDb data back and are not enriched again. The
+                file is removed once the output is saved.
         """
         if not os.path.exists(input_file):
-            print(f"❌ Error: Input file '{input_file}' not found")
+            logger.error(f"❌ Error: Input file '{input_file}' not found")
             return
             
         # Load existing data
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                films = json.load(f)
+            films = _load_json_file(input_file)
         except Exception as e:
-            print(f"❌ Error reading '{input_file}': {e}")
+            logger.error(f"❌ Error reading '{input_file}': {e}")
             return
             
         if not isinstance(films, list):
-            print(f"❌ Error: Expected JSON array in '{input_file}'")
+            logger.error(f"❌ Error: Expected JSON array in '{input_file}'")
             return
             
-        print(f"🎬 Starting TMDb enrichment for {len(films)} films...")
-        print(f"📖 Reading from: {input_file}")
+        logger.info(f"🎬 Starting TMDb enrichment for {len(films)} films...")
+        logger.info(f"📖 Reading from: {input_file}")
         
         if force_refresh:
-            print(f"🔄 Force refresh mode: Will update all TMDb data")
+            logger.info(f"🔄 Force refresh mode: Will update all TMDb data")
         
         if not self.api_key:
-            print("⚠️  No TMDb API key found - skipping enrichment")
+            logger.warning("⚠️  No TMDb API key found - skipping enrichment")
             return
             
-        # Enrich each film
-        enriched_count = 0
-        refreshed_count = 0
-        for i, film in enumerate(films, 1):
-            film_id = film.get('film_id', f'film_{i}')
-            print(f"🎭 Processing film {i}/{len(films)}: {film_id}")
-            
-            original_tmdb = film.get('tmdb') is not None
-            enriched_film = self.enrich_film(film, force_refresh=force_refresh)
-            
-            if enriched_film.get('tmdb'):
-                if not original_tmdb:
-                    enriched_count += 1
-                elif force_refresh and original_tmdb:
-                    refreshed_count += 1
-                
-        # Save results
         output_path = output_file or input_file
+        progress_path = f"{output_path}.jsonl" if progress_jsonl else None
+        
+        # Pick up where an interrupted run left off
+        resumed: Set[Any] = set()
+        if progress_path and os.path.exists(progress_path):
+            done = _load_progress(progress_path)
+            for film in films:
+                if film.get('film_id') in done:
+                    resumed.add(film['film_id'])
+                    if done[film['film_id']] is None:
+                        film.pop('tmdb', None)
+                    else:
+                        film['tmdb'] = done[film['film_id']]
+            logger.info(f"↩️  Resuming from {progress_path}: {len(resumed)} films already processed")
+        
+        # Enrich films concurrently
+        with (open(progress_path, 'ab') if progress_path else nullcontext()) as progress:
+            enriched_count, refreshed_count, unchanged_count, total_with_tmdb = asyncio.run(
+                self._enrich_all(films, force_refresh, full, progress, resumed))
+        
+        # Save results
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(films, f, indent=2, ensure_ascii=False)
-            print(f"💾 Results saved to: {output_path}")
+            if orjson:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(films, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(films, f, indent=2, ensure_ascii=False)
+            logger.info(f"💾 Results saved to: {output_path}")
         except Exception as e:
-            print(f"❌ Error writing to '{output_path}': {e}")
+            logger.error(f"❌ Error writing to '{output_path}': {e}")
             return
+        
+        if progress_path:
+            os.remove(progress_path)
             
         # Statistics
-        total_with_tmdb = sum(1 for film in films if film.get('tmdb'))
-        print(f"\n📈 TMDb Enrichment Complete!")
-        print(f"   • Films processed: {len(films)}")
-        print(f"   • New TMDb data added: {enriched_count}")
+        logger.info(f"\n📈 TMDb Enrichment Complete!")
+        logger.info(f"   • Films processed: {len(films)}")
+        logger.info(f"   • New TMDb data added: {enriched_count}")
         if force_refresh and refreshed_count > 0:
-            print(f"   • TMDb data refreshed: {refreshed_count}")
-        print(f"   • Total with TMDb data: {total_with_tmdb}/{len(films)}")
+            logger.info(f"   • TMDb data refreshed: {refreshed_count}")
+            logger.info(f"   • Unchanged on TMDb: {unchanged_count}")
+        logger.info(f"   • Total with TMDb data: {total_with_tmdb}/{len(films)}")
         
         if self.api_key:
-            print(f"   • TMDb API: ✅ Enabled")
+            logger.info(f"   • TMDb API: ✅ Enabled")
         else:
-            print(f"   • TMDb API: ❌ Disabled (no API key)")
+            logger.info(f"   • TMDb API: ❌ Disabled (no API key)")
 
 
 def main():
@@ -648,6 +1063,60 @@ Environment Variables:
         help='Force refresh all TMDb data, even if it already exists (default: True)'
     )
     
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Number of films enriched in parallel (default: 8)'
+    )
+    
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=40.0,
+        help='Maximum TMDb requests per second, 0 for no limit (default: 40)'
+    )
+    
+    parser.add_argument(
+        '--cache-file',
+        default='.tmdb_cache.sqlite3',
+        help='SQLite file used to cache TMDb responses (default: .tmdb_cache.sqlite3)'
+    )
+    
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=1800.0,
+        help='Seconds cached TMDb responses stay valid, e.g. 86400 to reuse '
+             'searches across daily runs (default: 1800)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always query TMDb instead of using cached responses'
+    )
+    
+    parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='Only report warnings and errors'
+    )
+    
+    parser.add_argument(
+        '--search-only',
+        action='store_true',
+        help='Build TMDb data from search results and skip the per-film details request '
+             '(leaves IMDb ID, runtime, budget and revenue empty)'
+    )
+    
+    parser.add_argument(
+        '--progress-jsonl',
+        action='store_true',
+        help='Append each processed film to <output>.jsonl during the run and resume '
+             'from it after a crash (removed once the output file is saved)'
+    )
+    
     parser.add_argument(
         '--skip-existing',
         action='store_true',
@@ -656,6 +1125,19 @@ Environment Variables:
     
     args = parser.parse_args()
     
+    # Log records are handed to a queue and written to stdout by a listener
+    # thread, so the event loop never blocks on terminal or pipe output.
+    # Only this script's logger is configured: the root logger would also
+    # pass on httpx's per-request lines, which include the API key in the URL.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.WARNING if args.quiet else logging.INFO)
+    logger.propagate = False
+    listener.start()
+    
     # Handle conflicting options
     if args.skip_existing:
         force_refresh = False
@@ -663,8 +1145,18 @@ Environment Variables:
         force_refresh = args.force_refresh
     
     # Create enricher and process files
-    enricher = TMDbEnricher(api_key=args.api_key)
-    enricher.enrich_films_file(args.input_file, args.output, force_refresh=force_refresh)
+    enricher = TMDbEnricher(
+        api_key=args.api_key,
+        concurrency=args.concurrency,
+        cache_path=None if args.no_cache else args.cache_file,
+        rate_limit=args.rate_limit,
+        cache_ttl=args.cache_ttl
+    )
+    try:
+        enricher.enrich_films_file(args.input_file, args.output, force_refresh=force_refresh,
+                                   full=not args.search_only, progress_jsonl=args.progress_jsonl)
+    finally:
+        listener.stop()
 
 
 if __name__ == '__main__':
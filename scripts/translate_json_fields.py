@@ -4,25 +4,201 @@ Generic JSON field translator using Google Gemini API.
 Translate any specified text fields in JSON files from one language to another.
 """
 
+import asyncio
 import json
 import os
+import sqlite3
 import sys
 import httpx
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from itertools import repeat
 from datetime import datetime
 import argparse
 
+from http_helpers import RateLimiter, SQLiteCache, send_with_retry
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
+
+# Parses str or bytes; Gemini replies are decoded straight from the raw body
+_json_loads = orjson.loads if orjson else json.loads
+
+# Longest backoff between retries of a Gemini request, in seconds
+_MAX_BACKOFF = 60.0
+
+# Batches are packed by estimated size (about 4 characters per token) so the
+# translations fit in one response; maxOutputTokens leaves room for English
+# coming out longer than the estimate and for the JSON punctuation
+_BATCH_TOKEN_BUDGET = 3000
+_MAX_OUTPUT_TOKENS = 8192
+
+
+def _load_json(path):
+    """Parse a JSON file, with orjson when it is installed."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return _json_loads(raw)
+
+
+def _estimate_tokens(text):
+    """Cheap token estimate for a text sent or returned as a JSON string."""
+    return len(text) // 4 + 4
+
+
+def _pack_batches(texts, max_items, token_budget=_BATCH_TOKEN_BUDGET):
+    """
+    Greedily group texts into batches bounded by item count and estimated tokens.
+    
+    Args:
+        texts (list): Texts to translate, in order
+        max_items (int): Maximum number of texts per batch
+        token_budget (int): Maximum estimated tokens per batch; a longer
+            single text still gets a batch of its own
+        
+    Returns:
+        list: List of text lists, one per API call
+    """
+    batches = []
+    batch = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = _estimate_tokens(text)
+        if batch and (len(batch) >= max_items or batch_tokens + tokens > token_budget):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
 
 class JSONFieldTranslator:
-    def __init__(self, gemini_api_key=None, source_language="Swedish", target_language="English"):
-        """Initialize the translator with Gemini API key and language settings."""
+    def __init__(self, gemini_api_key=None, source_language="Swedish", target_language="English",
+                 concurrency=8, requests_per_minute=30, cache_dir=".translate_cache"):
+        """Initialize the translator with Gemini API key and language settings.
+        
+        Args:
+            concurrency (int): Maximum number of batches translated at the same time
+            requests_per_minute (float): Maximum Gemini requests started per minute (0 = no limit)
+            cache_dir (str): Directory for the on-disk translation cache. None disables it.
+        """
         self.gemini_api_key = gemini_api_key or os.getenv('GEMINI_API_KEY')
         if not self.gemini_api_key:
             raise ValueError("Gemini API key is required. Set GEMINI_API_KEY environment variable or pass it as argument.")
         
         self.source_language = source_language
         self.target_language = target_language
+        
+        # Request URL and the fixed parts of both prompts only depend on the
+        # key and languages, so build them once
+        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
+        self._batch_prompt_prefix = f"""Translate these {source_language} texts to {target_language}. Keep the format and structure exactly the same for each text, only translate the words. If there are dates, times, numbers, or proper names, preserve their format. Be concise and natural.
+
+{source_language} texts as a JSON array:
+"""
+        self._batch_prompt_suffix = f"""
+
+Return a JSON array of the {target_language} translations, with the same length and order as the input."""
+        self._single_prompt_prefix = f"""Translate this {source_language} text to {target_language}. Keep the format and structure exactly the same, only translate the words. If there are dates, times, numbers, or proper names, preserve their format. Be concise and natural.
+
+{source_language} text: \""""
+        self._single_prompt_suffix = f'"\n\nReturn only the {target_language} translation without any explanation or quotes.'
+        
+        self.concurrency = max(1, concurrency)
+        self.limiter = RateLimiter(requests_per_minute, period=60.0, burst=self.concurrency)
+        # One long-lived client (and the loop its connections belong to) so
+        # every batch reuses the same HTTP/2 connection to Gemini
+        self._loop = asyncio.new_event_loop()
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=60.0,
+            headers={'Content-Type': 'application/json'},
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+        # Translations already known, in memory for this run and on disk
+        # across runs; showtime labels repeat a lot between films
+        self._cache = {}
+        self.disk_cache = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.disk_cache = SQLiteCache(os.path.join(cache_dir, "translations.sqlite3"))
+        self.cache_hits = 0
+    
+    def close(self):
+        """Close the HTTP client, its event loop and the translation cache."""
+        if self.client is not None:
+            self._loop.run_until_complete(self.client.aclose())
+            self.client = None
+        self._loop.close()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+            self.disk_cache = None
+    
+    def _cache_key(self, text):
+        """Key identifying ``text`` for the current language pair."""
+        key = f"{self.source_language}\x1f{self.target_language}\x1f{text.strip()}"
+        if len(key) > 128:
+            key = blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return key
+    
+    def _cached_translation(self, text):
+        """Return a known translation of ``text`` or None."""
+        key = self._cache_key(text)
+        translated = self._cache.get(key)
+        if translated is None and self.disk_cache is not None:
+            try:
+                translated = self.disk_cache.get(key)
+            except sqlite3.Error as e:
+                print(f"⚠️  Translation cache read failed: {e}")
+                return None
+            if translated is not None:
+                self._cache[key] = translated
+        return translated
+    
+    def _remember_translation(self, text, translated):
+        """Cache a successful translation of ``text``."""
+        if not translated:
+            return
+        key = self._cache_key(text)
+        self._cache[key] = translated
+        if self.disk_cache is not None:
+            # The translation is already known; a busy or broken cache file
+            # must never turn it into a failed batch
+            try:
+                self.disk_cache.set(key, translated)
+            except sqlite3.Error as e:
+                print(f"⚠️  Translation cache write failed: {e}")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    async def _post(self, payload, timeout):
+        """
+        Send a rate-limited Gemini request, retrying rate limits and transient failures.
+        
+        See http_helpers.send_with_retry.
+        
+        Args:
+            payload (dict): JSON request body
+            timeout (float): Per-request timeout in seconds
+            
+        Returns:
+            httpx.Response: The final response
+        """
+        return await send_with_retry(
+            lambda: self.client.post(self.api_url, json=payload, timeout=timeout),
+            self.limiter, "Gemini", print, max_backoff=_MAX_BACKOFF)
     
-    def translate_batch(self, texts_to_translate):
+    async def translate_batch(self, texts_to_translate):
         """
         Translate multiple texts using Google Gemini API in a single request.
         
@@ -31,101 +207,129 @@ class JSONFieldTranslator:
             
         Returns:
             list: List of translated texts in the same order
+            
+        Raises:
+            Exception: If Gemini rejects the request for a reason that
+                splitting the batch cannot fix (see _translate_with_split)
         """
         if not texts_to_translate:
             return []
             
-        # Filter out empty texts but keep track of their positions
-        text_map = {}
+        # Filter out empty and already translated texts but keep track of
+        # the positions of the rest
+        result_texts = list(texts_to_translate)
+        valid_positions = []
         valid_texts = []
         for i, text in enumerate(texts_to_translate):
             if text and text.strip():
-                text_map[len(valid_texts)] = i
+                cached = self._cached_translation(text)
+                if cached is not None:
+                    result_texts[i] = cached
+                    self.cache_hits += 1
+                    continue
+                valid_positions.append(i)
                 valid_texts.append(text)
             
         if not valid_texts:
-            return texts_to_translate
+            return result_texts
             
-        try:
-            # Prepare the API request
-            api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
+        # Fill the translations in around empty and cached texts
+        translated_texts = await self._translate_with_split(valid_texts)
+        for position, translated_text in zip(valid_positions, translated_texts):
+            result_texts[position] = translated_text
+        return result_texts
+    
+    async def _translate_with_split(self, texts):
+        """
+        Translate texts in one request, halving the batch when the reply is unusable.
+        
+        Only a reply of the wrong shape (undecodable JSON, a missing
+        candidate or the wrong number of translations) is likely to come
+        from one bad text. Both halves of such a batch are retried
+        concurrently, so that text costs a few extra requests instead of
+        one request per text. A single text that still fails goes to
+        translate_single_text. An HTTP error fails the whole batch at once:
+        Gemini answers a bad API key with a 400 too, and rate limits and
+        server errors have already been retried in _post, so smaller
+        requests would fail the same way.
+        
+        Args:
+            texts (list): Non-empty texts to translate
             
-            headers = {
-                'Content-Type': 'application/json',
-            }
+        Returns:
+            list: List of translated texts in the same order
             
-            # Create numbered list for batch translation
-            numbered_texts = []
-            for i, text in enumerate(valid_texts, 1):
-                numbered_texts.append(f"{i}. {text}")
+        Raises:
+            Exception: If the batch fails for a reason splitting cannot fix
+        """
+        try:
+            return await self._translate_batch_once(texts)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            # JSON decode errors are ValueErrors too
+            error = e
+        
+        if len(texts) == 1:
+            print(f"⚠️  Batch translation failed: {error}")
+            print(f"   Falling back to individual translation...")
+            return [await self.translate_single_text(texts[0])]
+        print(f"⚠️  Batch translation of {len(texts)} texts failed: {error}")
+        print(f"   Retrying as two smaller batches...")
+        middle = len(texts) // 2
+        left, right = await asyncio.gather(
+            self._translate_with_split(texts[:middle]),
+            self._translate_with_split(texts[middle:])
+        )
+        return left + right
+    
+    async def _translate_batch_once(self, texts):
+        """
+        Translate texts with a single Gemini request.
+        
+        Args:
+            texts (list): Non-empty texts to translate
             
-            prompt = f"""Translate these {self.source_language} texts to {self.target_language}. Keep the format and structure exactly the same for each text, only translate the words. If there are dates, times, numbers, or proper names, preserve their format. Be concise and natural.
-
-Maintain the numbered format in your response.
-
-{self.source_language} texts:
-{chr(10).join(numbered_texts)}
-
-Return only the {self.target_language} translations in the same numbered format without any explanation."""
+        Returns:
+            list: List of translated texts in the same order
             
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "maxOutputTokens": 2000,
-                    "topP": 0.8
+        Raises:
+            Exception: If the request fails or the reply does not hold one
+                translation per text
+        """
+        # Prepare the API request
+        prompt = f"{self._batch_prompt_prefix}{json.dumps(texts, ensure_ascii=False)}{self._batch_prompt_suffix}"
+        
+        payload = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": 0.1,
+                "maxOutputTokens": _MAX_OUTPUT_TOKENS,
+                "topP": 0.8,
+                # Structured output: Gemini must answer with a JSON array of strings
+                "responseMimeType": "application/json",
+                "responseSchema": {
+                    "type": "ARRAY",
+                    "items": {"type": "STRING"}
                 }
             }
-            
-            with httpx.Client(timeout=60.0) as client:  # Increased timeout
-                response = client.post(api_url, headers=headers, json=payload)
-                response.raise_for_status()
-                
-                result = response.json()
-                translated_response = result['candidates'][0]['content']['parts'][0]['text'].strip()
-                
-                # Parse the numbered response
-                translated_texts = self._parse_numbered_response(translated_response, len(valid_texts))
-                
-                # Reconstruct the full list with original empty texts
-                result_texts = texts_to_translate.copy()
-                for valid_idx, original_idx in text_map.items():
-                    if valid_idx < len(translated_texts):
-                        result_texts[original_idx] = translated_texts[valid_idx]
-                
-                return result_texts
-                
-        except Exception as e:
-            print(f"⚠️  Batch translation failed: {e}")
-            print(f"   Falling back to individual translations...")
-            # Fallback to individual translations
-            return [self.translate_single_text(text) for text in texts_to_translate]
-    
-    def _parse_numbered_response(self, response, expected_count):
-        """Parse numbered response from API."""
-        lines = response.split('\n')
-        translations = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and '. ' in line:
-                # Extract text after the number and period
-                parts = line.split('. ', 1)
-                if len(parts) == 2 and parts[0].isdigit():
-                    translation = parts[1].strip('"\'')
-                    translations.append(translation)
-        
-        # If we don't get the expected count, pad with original texts
-        while len(translations) < expected_count:
-            translations.append("")
-            
-        return translations[:expected_count]
+        }
+        
+        response = await self._post(payload, timeout=60.0)
+        response.raise_for_status()
+        
+        result = _json_loads(response.content)
+        translated_texts = _json_loads(result['candidates'][0]['content']['parts'][0]['text'])
+        if not isinstance(translated_texts, list) or len(translated_texts) != len(texts):
+            raise ValueError(f"expected a JSON array of {len(texts)} translations")
+        
+        for text, translated_text in zip(texts, translated_texts):
+            self._remember_translation(text, translated_text)
+        return translated_texts
     
-    def translate_single_text(self, text_to_translate):
+    async def translate_single_text(self, text_to_translate):
         """
         Translate single text using Google Gemini API (fallback method).
         
@@ -140,17 +344,7 @@ Return only the {self.target_language} translations in the same numbered format
             
         try:
             # Prepare the API request
-            api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
-            
-            headers = {
-                'Content-Type': 'application/json',
-            }
-            
-            prompt = f"""Translate this {self.source_language} text to {self.target_language}. Keep the format and structure exactly the same, only translate the words. If there are dates, times, numbers, or proper names, preserve their format. Be concise and natural.
-
-{self.source_language} text: "{text_to_translate}"
-
-Return only the {self.target_language} translation without any explanation or quotes."""
+            prompt = f"{self._single_prompt_prefix}{text_to_translate}{self._single_prompt_suffix}"
             
             payload = {
                 "contents": [{
@@ -165,123 +359,122 @@ Return only the {self.target_language} translation without any explanation or qu
                 }
             }
             
-            with httpx.Client(timeout=30.0) as client:  # Increased timeout
-                response = client.post(api_url, headers=headers, json=payload)
-                response.raise_for_status()
-                
-                result = response.json()
-                translated_text = result['candidates'][0]['content']['parts'][0]['text'].strip()
-                
-                # Clean up any quotes that might be added by the API
-                translated_text = translated_text.strip('"\'')
-                
-                return translated_text
+            response = await self._post(payload, timeout=30.0)
+            response.raise_for_status()
+            
+            result = _json_loads(response.content)
+            translated_text = result['candidates'][0]['content']['parts'][0]['text'].strip()
+            
+            # Clean up any quotes that might be added by the API
+            translated_text = translated_text.strip('"\'')
+            self._remember_translation(text_to_translate, translated_text)
+            
+            return translated_text
                 
         except Exception as e:
             print(f"⚠️  Translation failed for '{text_to_translate[:50]}...': {e}")
             return text_to_translate  # Return original text if translation fails
     
-    def _translate_nested_field(self, data, field_path, item_index=None, total_items=None):
+    def _collect_texts_for_translation(self, data, path_parts, text_references):
         """
-        Translate a field that may be nested in the data structure.
+        Collect all texts that need translation from the specified field path.
         
         Args:
             data (dict/list): The data containing the field
-            field_path (str): Dot notation path to the field (e.g., 'showtimes.display_text')
-            item_index (int): Index of current item being processed
-            total_items (int): Total number of items
-            
-        Returns:
-            int: Number of fields translated
+            path_parts (list): Field path already split on dots
+            text_references (list): List to append (object, field_key, text) tuples
         """
-        path_parts = field_path.split('.')
-        translated_count = 0
+        for obj, part in self._iter_field_owners(data, path_parts):
+            field_value = obj[part]
+            if isinstance(field_value, str) and field_value.strip():
+                # Check if already translated
+                if f"original_{part}" not in obj:
+                    text_references.append((obj, part, field_value))
+    
+    def _seed_cache_from_output(self, output_file, field_paths):
+        """
+        Reuse the translations stored in a previous output file.
         
-        def navigate_and_translate(obj, parts, current_path=""):
-            nonlocal translated_count
-            
-            if not parts:
-                return 0
-                
-            current_part = parts[0]
-            remaining_parts = parts[1:]
+        Args:
+            output_file (str): Translated JSON file from an earlier run
+            field_paths (list): List of dot-notation field paths to read
             
-            if isinstance(obj, dict):
-                if current_part in obj:
-                    if not remaining_parts:
-                        # This is the final field to translate
-                        field_value = obj[current_part]
-                        if isinstance(field_value, str) and field_value.strip():
-                            # Check if already translated
-                            original_key = f"original_{current_part}"
-                            if original_key in obj:
-                                print(f"   ⏭️  Field '{current_path}.{current_part}' already translated, skipping")
-                                return 0
-                            
-                            print(f"   🔄 Translating '{current_path}.{current_part}': '{field_value[:30]}...'")
-                            
-                            # Translate the text
-                            translated_text = self.translate_text(field_value)
-                            
-                            # Update with translation
-                            obj[original_key] = field_value  # Keep original
-                            obj[current_part] = translated_text  # Replace with translation
-                            
-                            print(f"   ✅ '{field_value[:30]}...' → '{translated_text[:30]}...'")
-                            return 1
-                    else:
-                        # Navigate deeper
-                        return navigate_and_translate(obj[current_part], remaining_parts, f"{current_path}.{current_part}" if current_path else current_part)
-                        
-            elif isinstance(obj, list):
-                count = 0
-                for i, item in enumerate(obj):
-                    count += navigate_and_translate(item, parts, f"{current_path}[{i}]" if current_path else f"[{i}]")
-                return count
-                
-            return 0
-        
-        return navigate_and_translate(data, path_parts)
+        Returns:
+            int: Number of translations added to the in-memory cache
+        """
+        data = _load_json(output_file)
+        seeded = 0
+        for field_path in field_paths:
+            for obj, part in self._iter_field_owners(data, field_path.split('.')):
+                original_text = obj.get(f"original_{part}")
+                translated_text = obj[part]
+                if isinstance(original_text, str) and isinstance(translated_text, str) and translated_text:
+                    self._cache[self._cache_key(original_text)] = translated_text
+                    seeded += 1
+        return seeded
     
-    def _collect_texts_for_translation(self, data, field_path, text_references):
+    def _iter_field_owners(self, data, path_parts):
         """
-        Collect all texts that need translation from the specified field path.
+        Yield every (object, field_key) pair where the field path ends.
         
         Args:
             data (dict/list): The data containing the field
-            field_path (str): Dot notation path to the field
-            text_references (list): List to append (object, field_key, text) tuples
+            path_parts (list): Field path already split on dots
+        """
+        last = len(path_parts) - 1
+        
+        # Walk with an explicit stack; lists are pushed in reverse so texts
+        # come out in document order
+        stack = [(data, 0)]
+        while stack:
+            obj, depth = stack.pop()
+            # Follow nested dicts in a tight loop; only lists go back on the stack
+            while True:
+                if isinstance(obj, dict):
+                    part = path_parts[depth]
+                    if depth == last:
+                        # This is the final field
+                        if part in obj:
+                            yield obj, part
+                        break
+                    try:
+                        obj = obj[part]
+                    except KeyError:
+                        break
+                    depth += 1
+                else:
+                    if isinstance(obj, list):
+                        stack.extend((item, depth) for item in reversed(obj))
+                    break
+    
+    async def _translate_batches(self, batches, apply_batch):
         """
-        path_parts = field_path.split('.')
+        Translate batches concurrently, keeping at most ``self.concurrency`` in flight.
         
-        def navigate_and_collect(obj, parts, current_path=""):
-            if not parts:
-                return
-                
-            current_part = parts[0]
-            remaining_parts = parts[1:]
-            
-            if isinstance(obj, dict):
-                if current_part in obj:
-                    if not remaining_parts:
-                        # This is the final field to collect
-                        field_value = obj[current_part]
-                        if isinstance(field_value, str) and field_value.strip():
-                            # Check if already translated
-                            original_key = f"original_{current_part}"
-                            if original_key not in obj:
-                                text_references.append((obj, current_part, field_value))
-                    else:
-                        # Navigate deeper
-                        navigate_and_collect(obj[current_part], remaining_parts, f"{current_path}.{current_part}" if current_path else current_part)
-                        
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    navigate_and_collect(item, parts, f"{current_path}[{i}]" if current_path else f"[{i}]")
-        
-        navigate_and_collect(data, path_parts)
+        Each batch's translations are handed to ``apply_batch`` as soon as
+        that batch is done, so applying them overlaps with the requests
+        still in flight.
+        
+        Args:
+            batches (list): List of text lists, one per API call
+            apply_batch (callable): Called with (batch, translations) per finished batch
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def bounded(batch_num, batch):
+            async with semaphore:
+                print(f"   📦 Processing batch {batch_num}/{len(batches)} ({len(batch)} texts)...")
+                try:
+                    translations = await self.translate_batch(batch)
+                except Exception as e:
+                    print(f"⚠️  Batch translation failed: {e}")
+                    return
+            apply_batch(batch, translations)
+        
+        await asyncio.gather(*(bounded(batch_num, batch) for batch_num, batch in enumerate(batches, 1)))
     
-    def translate_json_file(self, input_file, output_file=None, field_paths=None, batch_size=50):
+    def translate_json_file(self, input_file, output_file=None, field_paths=None, batch_size=50, resume=False,
+                            compact=False):
         """
         Translate specified field paths in a JSON file using batch processing.
         
@@ -289,7 +482,9 @@ Return only the {self.target_language} translation without any explanation or qu
             input_file (str): Path to input JSON file
             output_file (str): Path to output JSON file (optional)
             field_paths (list): List of dot-notation field paths to translate
-            batch_size (int): Number of texts to translate in one API call
+            batch_size (int): Maximum number of texts to translate in one API call
+            resume (bool): Reuse translations from an existing output file
+            compact (bool): Write the output without indentation
         """
         if not os.path.exists(input_file):
             raise FileNotFoundError(f"Input file not found: {input_file}")
@@ -303,9 +498,17 @@ Return only the {self.target_language} translation without any explanation or qu
         print(f"🌐 Translation: {self.source_language} → {self.target_language}")
         print(f"📦 Batch size: {batch_size}")
         
+        # Determine output file
+        if not output_file:
+            base_name = os.path.splitext(input_file)[0]
+            output_file = f"{base_name}_translated.json"
+        
+        if resume and os.path.exists(output_file) and not os.path.samefile(output_file, input_file):
+            seeded = self._seed_cache_from_output(output_file, field_paths)
+            print(f"♻️  Resuming with {seeded} translations from: {output_file}")
+        
         # Load the JSON file
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json(input_file)
         
         # Handle both list of objects and single object
         if isinstance(data, list):
@@ -321,68 +524,82 @@ Return only the {self.target_language} translation without any explanation or qu
         print(f"🔍 Collecting texts to translate...")
         text_references = []  # List of (object, field_key, original_text)
         
+        compiled_paths = [field_path.split('.') for field_path in field_paths]
         for item in items:
-            for field_path in field_paths:
-                self._collect_texts_for_translation(item, field_path, text_references)
+            for path_parts in compiled_paths:
+                self._collect_texts_for_translation(item, path_parts, text_references)
         
         total_texts = len(text_references)
-        print(f"📝 Found {total_texts} texts to translate")
         
         if total_texts == 0:
+            print(f"📝 Found 0 texts to translate")
             print(f"⚠️  No texts found to translate")
             return input_file
         
-        # Extract just the texts for batch translation
-        texts_to_translate = [ref[2] for ref in text_references]
-        
-        # Translate in batches
-        print(f"🚀 Starting batch translation...")
-        all_translations = []
+        # Translate each distinct text once and fan the result out to every
+        # (object, field_key) it came from
+        unique_texts = defaultdict(list)
+        for obj, field_key, original_text in text_references:
+            unique_texts[original_text].append((obj, field_key))
+        texts_to_translate = list(unique_texts)
+        print(f"📝 Found {total_texts} texts to translate ({len(texts_to_translate)} unique)")
         
-        for i in range(0, len(texts_to_translate), batch_size):
-            batch = texts_to_translate[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(texts_to_translate) + batch_size - 1) // batch_size
-            
-            print(f"   📦 Processing batch {batch_num}/{total_batches} ({len(batch)} texts)...")
-            
-            batch_translations = self.translate_batch(batch)
-            all_translations.extend(batch_translations)
-            
-            # Small delay between batches to avoid rate limiting
-            if i + batch_size < len(texts_to_translate):
-                import time
-                time.sleep(2)  # Increased delay to 2 seconds
-        
-        # Apply translations back to the data
-        print(f"📝 Applying translations to data...")
+        # Translate in batches, concurrently and rate limited
+        batches = _pack_batches(texts_to_translate, batch_size)
         translated_count = 0
         
-        for i, (obj, field_key, original_text) in enumerate(text_references):
-            if i < len(all_translations):
-                translated_text = all_translations[i]
+        def apply_batch(batch, translations):
+            # Apply translations back to the data while other batches run
+            nonlocal translated_count
+            for original_text, translated_text in zip(batch, translations):
                 if translated_text and translated_text != original_text:
-                    # Store original and update with translation
-                    obj[f"original_{field_key}"] = original_text
-                    obj[field_key] = translated_text
-                    translated_count += 1
+                    for obj, field_key in unique_texts[original_text]:
+                        # Store original and update with translation
+                        obj[f"original_{field_key}"] = original_text
+                        obj[field_key] = translated_text
+                        translated_count += 1
         
-        # Determine output file
-        if not output_file:
-            base_name = os.path.splitext(input_file)[0]
-            output_file = f"{base_name}_translated.json"
+        print(f"🚀 Starting batch translation ({len(batches)} batches)...")
+        self._loop.run_until_complete(self._translate_batches(batches, apply_batch))
         
         # Save the translated file
         print(f"💾 Saving translated data to: {output_file}")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(data) if compact else orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                if compact:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                else:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
 
         print(f"📊 TRANSLATION COMPLETE!")
         print(f"✅ Translated {translated_count} fields")
+        if self.cache_hits:
+            print(f"💾 Reused {self.cache_hits} cached translations")
         
         return output_file
 
 
+def _translate_one(input_file, translator_options, file_options):
+    """
+    Translate one file with its own translator (client, event loop and rate limiter).
+    
+    Module-level so ProcessPoolExecutor can pickle it.
+    
+    Args:
+        input_file (str): Path to input JSON file
+        translator_options (dict): Keyword arguments for JSONFieldTranslator
+        file_options (dict): Keyword arguments for translate_json_file
+        
+    Returns:
+        str: Path to the translated file
+    """
+    with JSONFieldTranslator(**translator_options) as translator:
+        return translator.translate_json_file(input_file, **file_options)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Translate text fields in JSON files using Gemini API',
@@ -400,11 +617,12 @@ Usage examples:
   python3 translate_json_fields.py data.json -f "showtimes.display_text,cinemas.name"
   python3 translate_json_fields.py data.json --source Swedish --target English
   python3 translate_json_fields.py data.json --fields title -k "your_api_key"
+  python3 translate_json_fields.py data/*.json     # files are translated in parallel
         """
     )
     
-    parser.add_argument('input_file', help='Path to input JSON file')
-    parser.add_argument('-o', '--output', help='Path to output JSON file (optional)')
+    parser.add_argument('input_file', nargs='+', help='Path to input JSON file(s)')
+    parser.add_argument('-o', '--output', help='Path to output JSON file (optional, single input only)')
     parser.add_argument('-k', '--api-key', help='Gemini API key (or set GEMINI_API_KEY env variable)')
     parser.add_argument('-f', '--fields', 
                        help='Comma-separated list of field paths to translate (default: showtimes.display_text)',
@@ -417,10 +635,34 @@ Usage examples:
                        default='English')
     parser.add_argument('-b', '--batch-size',
                        type=int,
-                       help='Number of texts to translate in one API call (default: 50)',
+                       help='Maximum number of texts to translate in one API call; '
+                            'batches are also limited by text length (default: 50)',
                        default=50)
+    parser.add_argument('-c', '--concurrency',
+                       type=int,
+                       help='Number of batches translated in parallel (default: 8)',
+                       default=8)
+    parser.add_argument('--rpm',
+                       type=float,
+                       help='Maximum Gemini requests per minute, 0 for no limit (default: 30)',
+                       default=30)
+    parser.add_argument('--cache-dir',
+                       help='Directory for the on-disk translation cache (default: .translate_cache)',
+                       default='.translate_cache')
+    parser.add_argument('--no-cache',
+                       action='store_true',
+                       help='Always ask Gemini instead of reusing cached translations')
+    parser.add_argument('--resume',
+                       action='store_true',
+                       help='Reuse translations already present in the output file from an earlier run')
+    parser.add_argument('--compact',
+                       action='store_true',
+                       help='Write the output JSON without indentation')
     
-    args = parser.parse_args()
+    # Intermixed so input files may also follow the options
+    args = parser.parse_intermixed_args()
+    if args.output and len(args.input_file) > 1:
+        parser.error("-o/--output can only be used with a single input file")
     
     try:
         # Parse field paths to translate
@@ -428,18 +670,41 @@ Usage examples:
         
         print(f"🎯 Will translate field paths: {', '.join(field_paths)}")
         
-        # Initialize translator
-        translator = JSONFieldTranslator(
+        # One worker process per file, up to the CPU count. The request
+        # budget is split between them, and with it each worker's burst
+        # (capped at its per-minute share), so every worker gets at least
+        # one request per minute and their bursts add up to at most --rpm
+        workers = min(len(args.input_file), os.cpu_count() or 1)
+        if args.rpm > 0:
+            workers = min(workers, max(1, int(args.rpm)))
+        translator_options = dict(
             gemini_api_key=args.api_key,
             source_language=args.source,
-            target_language=args.target
+            target_language=args.target,
+            concurrency=args.concurrency,
+            requests_per_minute=args.rpm / workers,
+            cache_dir=None if args.no_cache else args.cache_dir
+        )
+        file_options = dict(
+            output_file=args.output,
+            field_paths=field_paths,
+            batch_size=args.batch_size,
+            resume=args.resume,
+            compact=args.compact
         )
         
-        # Translate the file
-        output_file = translator.translate_json_file(args.input_file, args.output, field_paths, args.batch_size)
+        # Translate the file(s)
+        if workers == 1:
+            output_files = [_translate_one(input_file, translator_options, file_options)
+                            for input_file in args.input_file]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                output_files = list(pool.map(_translate_one, args.input_file,
+                                             repeat(translator_options), repeat(file_options)))
         
         print(f"\n🎉 Translation completed successfully!")
-        print(f"📁 Translated file: {output_file}")
+        for output_file in output_files:
+            print(f"📁 Translated file: {output_file}")
         
     except Exception as e:
         print(f"❌ Error: {e}")